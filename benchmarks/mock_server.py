@@ -0,0 +1,244 @@
+"""Local stand-in for the HubSpot Automation v4 flows API."""
+
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+FLOW_PATH = re.compile(r"^/automation/v4/flows/([^/]+)$")
+LIST_PATH = "/automation/v4/flows"
+
+
+class MockHubSpotServer:
+    """
+    Threaded HTTP server serving /automation/v4/flows from an in-memory portal.
+
+    Supports cursor paging, per-flow GET (with ETag / If-None-Match) and
+    PUT (bumping revisionId), fixed per-request latency, HubSpot rate-limit headers and periodic 429
+    injection.
+    """
+
+    def __init__(
+        self,
+        flows: dict,
+        latency: float = 0.0,
+        page_size: int = 100,
+        throttle_every: int = 0,
+        retry_after: int = 1,
+        rate_limit_max: int = 0,
+        rate_limit_interval_ms: int = 10000,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize server.
+
+        Args:
+            flows: Dict mapping flow ID strings to flow dicts.
+            latency: Seconds to sleep before answering each request.
+            page_size: Maximum results per list page.
+            throttle_every: Answer every Nth request with 429. 0 disables.
+            retry_after: Retry-After seconds sent with injected 429s.
+            rate_limit_max: If set, send X-HubSpot-RateLimit-* headers for a
+                window of this many requests.
+            rate_limit_interval_ms: Rate-limit window length.
+            host: Bind address.
+            port: Bind port; 0 picks a free port.
+        """
+        self.flows = flows
+        self.latency = latency
+        self.page_size = page_size
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.rate_limit_max = rate_limit_max
+        self.rate_limit_interval_ms = rate_limit_interval_ms
+        self.counts: dict = {"GET": 0, "PUT": 0, "429": 0, "304": 0}
+        self._bodies: dict = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockHubSpotServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockHubSpotServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def update_flow(self, flow_id: str, **changes) -> dict:
+        """
+        Edit a flow as if in the HubSpot UI, bumping its revisionId.
+
+        Args:
+            flow_id: ID of the flow to edit.
+            **changes: Flow fields to set.
+
+        Returns:
+            The updated flow.
+        """
+        with self._lock:
+            updated = copy.deepcopy(self.flows[flow_id])
+            updated.update(changes)
+            updated["revisionId"] = str(int(updated.get("revisionId", "0")) + 1)
+            self.flows[flow_id] = updated
+            self._bodies.pop(flow_id, None)
+        return updated
+
+    def _flow_body(self, flow_id: str) -> Optional[bytes]:
+        """Return a flow's serialized JSON, cached so the server stays cheap."""
+        body = self._bodies.get(flow_id)
+        if body is None:
+            flow = self.flows.get(flow_id)
+            if flow is None:
+                return None
+            body = json.dumps(flow).encode("utf-8")
+            self._bodies[flow_id] = body
+        return body
+
+    def _admit(self, method: str) -> tuple:
+        """Count a request; return (throttled, rate-limit headers)."""
+        with self._lock:
+            self._requests += 1
+            self.counts[method] = self.counts.get(method, 0) + 1
+            throttled = bool(self.throttle_every) and self._requests % self.throttle_every == 0
+            if throttled:
+                self.counts["429"] += 1
+
+            headers = {}
+            if self.rate_limit_max:
+                now = time.monotonic()
+                if (now - self._window_start) * 1000 >= self.rate_limit_interval_ms:
+                    self._window_start = now
+                    self._window_count = 0
+                self._window_count += 1
+                headers = {
+                    "X-HubSpot-RateLimit-Max": str(self.rate_limit_max),
+                    "X-HubSpot-RateLimit-Interval-Milliseconds": str(self.rate_limit_interval_ms),
+                    "X-HubSpot-RateLimit-Remaining": str(
+                        max(0, self.rate_limit_max - self._window_count)
+                    ),
+                }
+            return throttled, headers
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: object, headers: dict) -> None:
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _start(self, method: str) -> Optional[dict]:
+                if server.latency:
+                    time.sleep(server.latency)
+                throttled, headers = server._admit(method)
+                if throttled:
+                    headers["Retry-After"] = str(server.retry_after)
+                    self._send(429, {"status": "error", "category": "RATE_LIMITS"}, headers)
+                    return None
+                return headers
+
+            def do_GET(self) -> None:
+                headers = self._start("GET")
+                if headers is None:
+                    return
+                url = urlparse(self.path)
+                match = FLOW_PATH.match(url.path)
+                if match:
+                    body = server._flow_body(match.group(1))
+                    if body is None:
+                        self._send(404, {"status": "error"}, headers)
+                        return
+                    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                    headers["ETag"] = etag
+                    if self.headers.get("If-None-Match") == etag:
+                        with server._lock:
+                            server.counts["304"] += 1
+                        self._send(304, b"", headers)
+                    else:
+                        self._send(200, body, headers)
+                    return
+                if url.path != LIST_PATH:
+                    self._send(404, {"status": "error"}, headers)
+                    return
+
+                query = parse_qs(url.query)
+                limit = min(int(query.get("limit", ["100"])[0]), server.page_size)
+                after = int(query.get("after", ["0"])[0])
+                ids = list(server.flows)
+                page = ids[after:after + limit]
+                body = {
+                    "results": [
+                        {
+                            key: server.flows[flow_id].get(key)
+                            for key in (
+                                "id", "name", "isEnabled", "flowType",
+                                "revisionId", "createdAt", "updatedAt",
+                            )
+                        }
+                        for flow_id in page
+                    ]
+                }
+                if after + limit < len(ids):
+                    body["paging"] = {"next": {"after": str(after + limit)}}
+                self._send(200, body, headers)
+
+            def do_PUT(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                headers = self._start("PUT")
+                if headers is None:
+                    return
+                match = FLOW_PATH.match(urlparse(self.path).path)
+                flow_id = match.group(1) if match else None
+                with server._lock:
+                    current = server.flows.get(flow_id)
+                    if current is None:
+                        self._send(404, {"status": "error"}, headers)
+                        return
+                    if str(payload.get("revisionId")) != str(current.get("revisionId")):
+                        self._send(409, {"status": "error", "category": "CONFLICT"}, headers)
+                        return
+                    updated = copy.deepcopy(current)
+                    updated.update(payload)
+                    updated["id"] = flow_id
+                    updated["revisionId"] = str(int(current.get("revisionId", "0")) + 1)
+                    server.flows[flow_id] = updated
+                    server._bodies.pop(flow_id, None)
+                self._send(200, updated, headers)
+
+        return Handler
@@ -0,0 +1,233 @@
+"""
+End-to-end benchmarks against a local mock HubSpot server.
+
+Usage:
+    python -m benchmarks.run --flows 500 --actions 40 --latency 0.02 --workers 1,8,32
+"""
+
+import argparse
+import copy
+import json
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from ft_hubspot_workflow_backup import (
+    HubSpotClient,
+    RateLimiter,
+    backup_all_flows,
+    restore_flow,
+    restore_snapshot,
+    verify_backups,
+)
+from ft_hubspot_workflow_backup.backup import normalize_flow
+from ft_hubspot_workflow_backup.restore import renumber_actions
+from ft_hubspot_workflow_backup.serialize import STYLES, available_backends, serialize_flow
+
+from .mock_server import MockHubSpotServer
+from .synthetic import generate_deep_flow, generate_flows
+
+
+def _time(func: Callable, repeat: int = 1) -> dict:
+    """Run func repeat times and return timing stats in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "runs": repeat,
+    }
+
+
+def bench_normalize(flows: dict, repeat: int) -> dict:
+    copies = [[copy.deepcopy(f) for f in flows.values()] for _ in range(repeat)]
+    batches = iter(copies)
+
+    def run():
+        for flow in next(batches):
+            normalize_flow(flow)
+
+    return _time(run, repeat)
+
+
+def bench_normalize_deep(depth: int, repeat: int) -> dict:
+    # Built fresh each time: copy.deepcopy itself recurses per level.
+    batches = iter([generate_deep_flow(1, depth) for _ in range(repeat)])
+    return _time(lambda: normalize_flow(next(batches)), repeat)
+
+
+def bench_serialize(flows: dict, style: str, backend: str, repeat: int) -> dict:
+    normalized = [normalize_flow(copy.deepcopy(f)) for f in flows.values()]
+
+    def run():
+        for details in normalized:
+            serialize_flow(details, style=style, backend=backend)
+
+    return _time(run, repeat)
+
+
+def bench_renumber(flows: dict, repeat: int) -> dict:
+    fetched_objects = {"1": "2", "2": "3", "3": "1"}
+
+    def run():
+        for flow in flows.values():
+            renumber_actions(flow["actions"], flow["startActionId"], "1000", fetched_objects)
+
+    return _time(run, repeat)
+
+
+def _client(server: MockHubSpotServer, pool_size: int = 10) -> HubSpotClient:
+    limiter = RateLimiter(
+        max_requests=server.rate_limit_max,
+        interval=server.rate_limit_interval_ms / 1000,
+    )
+    return HubSpotClient(
+        token="benchmark",
+        base_url=server.base_url,
+        pool_size=pool_size,
+        rate_limiter=limiter,
+    )
+
+
+def bench_backup(server: MockHubSpotServer, workers: int, root: Path) -> tuple:
+    runs = []
+
+    def run():
+        client = _client(server, pool_size=workers)
+        try:
+            runs.append(backup_all_flows(
+                client=client,
+                output_dir=root / f"workers-{workers}",
+                use_date_dir=True,
+                max_workers=workers,
+            ))
+        finally:
+            client.close()
+
+    return _time(run), runs[-1]
+
+
+def bench_verify(snapshot: Path, repeat: int) -> dict:
+    return _time(lambda: verify_backups(snapshot), repeat)
+
+
+def bench_restore(server: MockHubSpotServer, snapshot: Path, count: int) -> dict:
+    index = json.loads((snapshot / "_index.json").read_text(encoding="utf-8"))
+    entries = index["flows"][:count]
+    client = _client(server)
+
+    def run():
+        for entry in entries:
+            restore_flow(snapshot / entry["filename"], client=client)
+
+    try:
+        return _time(run)
+    finally:
+        client.close()
+
+
+def bench_restore_snapshot(server: MockHubSpotServer, snapshot: Path, count: int, workers: int) -> dict:
+    index = json.loads((snapshot / "_index.json").read_text(encoding="utf-8"))
+    flow_ids = [entry["id"] for entry in index["flows"][:count]]
+    client = _client(server, pool_size=workers)
+
+    def run():
+        restore_snapshot(snapshot, flow_ids=flow_ids, client=client, max_workers=workers)
+
+    try:
+        return _time(run)
+    finally:
+        client.close()
+
+
+def main() -> None:
+    """CLI entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flows", type=int, default=200, help="Number of workflows (default: 200)")
+    parser.add_argument("--actions", type=int, default=30, help="Actions per workflow (default: 30)")
+    parser.add_argument("--depth", type=int, default=2, help="Filter branch nesting depth (default: 2)")
+    parser.add_argument("--filters", type=int, default=4, help="Filters per branch (default: 4)")
+    parser.add_argument("--latency", type=float, default=0.01, help="Mock server latency in seconds (default: 0.01)")
+    parser.add_argument("--throttle-every", type=int, default=0, help="Inject a 429 every N requests (default: off)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds for injected 429s (default: 1)")
+    parser.add_argument("--rate-limit", type=int, default=10000, help="Mock quota per 10s window (default: 10000)")
+    parser.add_argument("--workers", default="1,8", help="Comma-separated worker counts for backup (default: 1,8)")
+    parser.add_argument("--restore", type=int, default=20, help="Number of flows to restore (default: 20)")
+    parser.add_argument(
+        "--deep-depth",
+        type=int,
+        default=400,
+        help="Filter branch depth of the deep normalize_flow case; 0 skips it (default: 400)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats for CPU-bound benchmarks (default: 3)")
+    parser.add_argument("--json", dest="json_path", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    print(f"Generating {args.flows} flows x {args.actions} actions (depth {args.depth})...")
+    flows = generate_flows(args.flows, actions=args.actions, branch_depth=args.depth, filters=args.filters)
+
+    results: dict = {"config": vars(args), "benchmarks": {}}
+    benchmarks = results["benchmarks"]
+
+    benchmarks["normalize_flow"] = bench_normalize(flows, args.repeat)
+    if args.deep_depth:
+        benchmarks[f"normalize_flow[depth={args.deep_depth}]"] = bench_normalize_deep(
+            args.deep_depth, args.repeat
+        )
+    for style in STYLES:
+        for backend in available_backends():
+            benchmarks[f"serialize_flow[{style},{backend}]"] = bench_serialize(
+                flows, style, backend, args.repeat
+            )
+    benchmarks["renumber_actions"] = bench_renumber(flows, args.repeat)
+
+    root = Path(tempfile.mkdtemp(prefix="hubspot-bench-"))
+    try:
+        with MockHubSpotServer(
+            flows,
+            latency=args.latency,
+            throttle_every=args.throttle_every,
+            retry_after=args.retry_after,
+            rate_limit_max=args.rate_limit,
+        ) as server:
+            snapshot = None
+            for workers in worker_counts:
+                stats, snapshot = bench_backup(server, workers, root)
+                stats["flows_per_second"] = args.flows / stats["median"]
+                benchmarks[f"backup_all_flows[workers={workers}]"] = stats
+
+            if snapshot is not None:
+                benchmarks["verify_backups"] = bench_verify(snapshot, args.repeat)
+                if args.restore:
+                    benchmarks["restore_flow"] = bench_restore(server, snapshot, args.restore)
+                    workers = max(worker_counts)
+                    benchmarks[f"restore_snapshot[workers={workers}]"] = bench_restore_snapshot(
+                        server, snapshot, args.restore, workers
+                    )
+
+            results["requests"] = dict(server.counts)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"\n{'benchmark':<40} {'median (s)':>12} {'min (s)':>10} {'flows/s':>10}")
+    for name, stats in benchmarks.items():
+        rate = stats.get("flows_per_second")
+        rate_text = f"{rate:>10.1f}" if rate else f"{'':>10}"
+        print(f"{name:<40} {stats['median']:>12.4f} {stats['min']:>10.4f} {rate_text}")
+    print(f"\nRequests served: {results.get('requests')}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Synthetic HubSpot Automation v4 workflows for benchmarks."""
+
+import random
+from typing import Optional
+
+PROPERTIES = [
+    "email", "firstname", "lastname", "lifecyclestage", "hs_lead_status",
+    "country", "industry", "annualrevenue", "jobtitle", "company",
+]
+OPERATORS = ["IS_EQUAL_TO", "IS_NOT_EQUAL_TO", "CONTAINS", "IS_ANY_OF", "IS_KNOWN"]
+
+
+def _filter(rng: random.Random) -> dict:
+    operation = {"operator": rng.choice(OPERATORS), "operationType": "MULTISTRING"}
+    if rng.random() < 0.5:
+        operation["value"] = f"value-{rng.randint(0, 999)}"
+    else:
+        operation["values"] = [f"v{rng.randint(0, 99)}" for _ in range(rng.randint(1, 4))]
+    return {
+        "property": rng.choice(PROPERTIES),
+        "filterType": rng.choice(["PROPERTY", "PROPERTY", "ASSOCIATION"]),
+        "operation": operation,
+    }
+
+
+def _filter_branch(rng: random.Random, depth: int, filters: int) -> dict:
+    branch = {
+        "filterBranchType": "AND" if depth % 2 else "OR",
+        "filterBranchOperator": "AND" if depth % 2 else "OR",
+        "filters": [_filter(rng) for _ in range(filters)],
+        "filterBranches": [],
+    }
+    if depth > 0:
+        branch["filterBranches"] = [
+            _filter_branch(rng, depth - 1, filters) for _ in range(2)
+        ]
+    return branch
+
+
+def generate_flow(
+    flow_id: int,
+    actions: int = 20,
+    branch_depth: int = 3,
+    filters: int = 4,
+    data_sources: int = 3,
+    seed: Optional[int] = None,
+) -> dict:
+    """
+    Build one synthetic workflow shaped like a v4 flow response.
+
+    Args:
+        flow_id: Flow ID.
+        actions: Number of actions in the flow.
+        branch_depth: Nesting depth of enrollment and list-branch filter trees.
+        filters: Filters per filter branch.
+        data_sources: Number of fetched_object data sources.
+        seed: Random seed; defaults to flow_id so output is reproducible.
+
+    Returns:
+        Flow dict.
+    """
+    rng = random.Random(flow_id if seed is None else seed)
+    first_action = 1
+
+    flow_actions = []
+    for i in range(actions):
+        action_id = first_action + i
+        next_id = str(action_id + 1) if i < actions - 1 else None
+        ref = rng.randint(first_action, action_id)
+        fetched = rng.randint(1, max(1, data_sources))
+        kind = rng.random()
+        if kind < 0.15 and next_id:
+            action = {
+                "actionId": str(action_id),
+                "actionTypeVersion": 0,
+                "actionTypeId": "0-1",
+                "type": "LIST_BRANCH",
+                "listBranches": [
+                    {
+                        "filterBranch": _filter_branch(rng, branch_depth, filters),
+                        "connection": {"edgeType": "STANDARD", "nextActionId": next_id},
+                    }
+                    for _ in range(2)
+                ],
+                "defaultBranch": {"edgeType": "STANDARD", "nextActionId": next_id},
+            }
+        elif kind < 0.25 and next_id:
+            action = {
+                "actionId": str(action_id),
+                "type": "STATIC_BRANCH",
+                "inputValue": {"actionId": str(ref), "actionOutputType": "STRING"},
+                "staticBranches": [
+                    {"branchValue": f"b{n}", "connection": {"nextActionId": next_id}}
+                    for n in range(3)
+                ],
+                "defaultBranch": {"edgeType": "STANDARD", "nextActionId": next_id},
+            }
+        else:
+            action = {
+                "actionId": str(action_id),
+                "actionTypeVersion": 0,
+                "actionTypeId": "0-5",
+                "type": "SINGLE_CONNECTION",
+                "fields": {
+                    "property_name": rng.choice(PROPERTIES),
+                    "value": {
+                        "type": "STATIC_VALUE",
+                        "staticValue": (
+                            f"{{{{ action_outputs.action_output_{ref} }}}} "
+                            f"{{{{ fetched_objects.fetched_object_{fetched}.hs_object_id }}}}"
+                        ),
+                    },
+                },
+            }
+            if next_id:
+                action["connection"] = {"edgeType": "STANDARD", "nextActionId": next_id}
+        flow_actions.append(action)
+
+    return {
+        "id": str(flow_id),
+        "name": f"Synthetic workflow {flow_id}",
+        "type": "CONTACT_FLOW",
+        "flowType": "WORKFLOW",
+        "objectTypeId": "0-1",
+        "isEnabled": rng.random() < 0.7,
+        "revisionId": "1",
+        "createdAt": "2025-01-01T00:00:00Z",
+        "updatedAt": "2025-01-01T00:00:00Z",
+        "startActionId": str(first_action) if actions else None,
+        "nextAvailableActionId": str(first_action + actions),
+        "actions": flow_actions,
+        "enrollmentCriteria": {
+            "type": "LIST_BASED",
+            "shouldReEnroll": True,
+            "listFilterBranch": _filter_branch(rng, branch_depth, filters),
+            "reEnrollmentTriggersFilterBranches": [
+                _filter_branch(rng, 0, filters) for _ in range(3)
+            ],
+        },
+        "dataSources": [
+            {
+                "name": f"fetched_object_{n}",
+                "type": "ASSOCIATION",
+                "objectTypeId": rng.choice(["0-1", "0-2", "0-3"]),
+                "associationTypeId": rng.randint(1, 300),
+                "associationCategory": "HUBSPOT_DEFINED",
+            }
+            for n in range(data_sources, 0, -1)
+        ],
+        "blockedDates": [],
+        "customProperties": {},
+    }
+
+
+def generate_deep_flow(flow_id: int, depth: int, filters: int = 4) -> dict:
+    """
+    Build a flow whose enrollment filter tree is a single chain `depth` levels deep.
+
+    Args:
+        flow_id: Flow ID; also the random seed.
+        depth: Number of nested filter branches.
+        filters: Filters per filter branch.
+
+    Returns:
+        Flow dict.
+    """
+    rng = random.Random(flow_id)
+    flow = generate_flow(flow_id, actions=1, branch_depth=0, filters=filters)
+    branch = flow["enrollmentCriteria"]["listFilterBranch"]
+    for _ in range(depth):
+        child = _filter_branch(rng, 0, filters)
+        branch["filterBranches"] = [child]
+        branch = child
+    return flow
+
+
+def generate_flows(
+    count: int,
+    actions: int = 20,
+    branch_depth: int = 3,
+    filters: int = 4,
+    first_id: int = 100000,
+) -> dict:
+    """
+    Build a portal's worth of synthetic workflows.
+
+    Args:
+        count: Number of flows.
+        actions: Actions per flow.
+        branch_depth: Nesting depth of filter trees.
+        filters: Filters per filter branch.
+        first_id: ID of the first flow.
+
+    Returns:
+        Dict mapping flow ID strings to flow dicts.
+    """
+    flows = {}
+    for flow_id in range(first_id, first_id + count):
+        flows[str(flow_id)] = generate_flow(
+            flow_id, actions=actions, branch_depth=branch_depth, filters=filters
+        )
+    return flows
@@ -1,14 +1,61 @@
-from .client import HubSpotClient
-from .backup import backup_all_flows, get_timestamp, slugify, verify_backups
-from .restore import restore_flow
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache import FlowCache
+    from .catalog import Catalog
+    from .client import HubSpotClient
+    from .async_client import AsyncHubSpotClient
+    from .metrics import Metrics
+    from .ratelimit import RateLimiter
+    from .backup import async_backup_all_flows, backup_all_flows, get_timestamp, slugify, watch_flows
+    from .diff import diff_snapshots
+    from .inspection import inspect_snapshot
+    from .portals import backup_portals
+    from .retention import apply_retention
+    from .restore import async_restore_flow, restore_flow, restore_snapshot
+    from .verify import VerifyCache, verify_all_snapshots, verify_backups
 
 __version__ = "0.1.4"
 
-__all__ = [
-    "HubSpotClient",
-    "backup_all_flows",
-    "restore_flow",
-    "verify_backups",
-    "get_timestamp",
-    "slugify",
-]
+# Public name -> defining module. Modules are imported on first attribute
+# access, so offline commands (verify, inspect, catalog, retention) never
+# load requests or urllib3.
+_EXPORTS = {
+    "HubSpotClient": "client",
+    "AsyncHubSpotClient": "async_client",
+    "RateLimiter": "ratelimit",
+    "FlowCache": "cache",
+    "Metrics": "metrics",
+    "backup_all_flows": "backup",
+    "async_backup_all_flows": "backup",
+    "watch_flows": "backup",
+    "backup_portals": "portals",
+    "restore_flow": "restore",
+    "restore_snapshot": "restore",
+    "async_restore_flow": "restore",
+    "diff_snapshots": "diff",
+    "inspect_snapshot": "inspection",
+    "apply_retention": "retention",
+    "verify_backups": "verify",
+    "verify_all_snapshots": "verify",
+    "VerifyCache": "verify",
+    "Catalog": "catalog",
+    "get_timestamp": "backup",
+    "slugify": "backup",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
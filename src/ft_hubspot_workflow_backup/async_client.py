@@ -0,0 +1,219 @@
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from .ratelimit import RateLimiter, parse_retry_after
+
+if TYPE_CHECKING:
+    from .metrics import Metrics
+
+
+class AsyncHubSpotClient:
+    """Asyncio client for HubSpot Automation v4 API."""
+
+    BASE_URL = "https://api.hubapi.com"
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_rate_limit_retries: int = 8,
+        base_url: Optional[str] = None,
+        metrics: Optional["Metrics"] = None,
+    ):
+        """
+        Initialize client.
+
+        Args:
+            token: HubSpot private app token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
+            pool_size: Maximum number of pooled keep-alive connections.
+            max_retries: Retries for connection errors and 5xx responses. PUTs
+                are only retried when the connection could not be established.
+            backoff_factor: Exponential backoff factor between retries, in seconds.
+            rate_limiter: RateLimiter pacing requests. Share one instance between
+                clients that use the same private app quota.
+            max_rate_limit_retries: Retries for 429 responses before giving up.
+            base_url: API root. Defaults to BASE_URL; override for proxies or
+                a local mock server.
+            metrics: Metrics collector recording request latency, bytes,
+                status codes and retries.
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncHubSpotClient requires httpx. "
+                "Install with: pip install 'ft-hubspot-workflow-backup[async]'"
+            )
+        self.token = token or os.getenv("HUBSPOT_AUTOMATION_TOKEN")
+        if not self.token:
+            raise ValueError(
+                "HubSpot token required. Pass token= or set HUBSPOT_AUTOMATION_TOKEN env var."
+            )
+        self._headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json",
+        }
+
+        self.max_retries = max_retries
+        self.metrics = metrics
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+        self._client = httpx.AsyncClient(
+            headers=self._headers,
+            timeout=30,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=max_retries),
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncHubSpotClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """
+        Send a request paced by the rate limiter, retrying 429 and 5xx responses.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Passed through to httpx.AsyncClient.request.
+
+        Returns:
+            Successful response.
+        """
+        rate_limit_attempt = 0
+        status_attempt = 0
+        while True:
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            resp = await self._send(method, url, **kwargs)
+            self.rate_limiter.update(resp.headers)
+
+            if resp.status_code == 429 and rate_limit_attempt < self.max_rate_limit_retries:
+                delay = parse_retry_after(resp.headers.get("Retry-After"))
+                if delay is None:
+                    delay = self.backoff_factor * (2 ** rate_limit_attempt)
+                if self.metrics is not None:
+                    self.metrics.observe_retry("rate_limit")
+                self.rate_limiter.pause(delay)
+                rate_limit_attempt += 1
+                continue
+
+            if (
+                resp.status_code in self.RETRY_STATUSES
+                and method == "GET"
+                and status_attempt < self.max_retries
+            ):
+                if self.metrics is not None:
+                    self.metrics.observe_retry("server_error")
+                await asyncio.sleep(self.backoff_factor * (2 ** status_attempt))
+                status_attempt += 1
+                continue
+
+            break
+        resp.raise_for_status()
+        return resp
+
+    async def _send(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """Send one request through the client, recording it in metrics."""
+        if self.metrics is None:
+            return await self._client.request(method, url, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            resp = await self._client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.metrics.observe_request(method, None, time.perf_counter() - start)
+            raise
+        self.metrics.observe_request(
+            method,
+            resp.status_code,
+            time.perf_counter() - start,
+            bytes_sent=len(resp.request.content),
+            bytes_received=len(resp.content),
+        )
+        return resp
+
+    async def iter_flows(self) -> AsyncIterator[dict]:
+        """
+        Iterate over all automation flows, fetching pages lazily.
+
+        Yields:
+            Flow summary dicts.
+        """
+        url = f"{self.base_url}/automation/v4/flows"
+        params = {"limit": 100}
+
+        while True:
+            resp = await self._request("GET", url, params=params)
+
+            data = resp.json()
+            for flow in data.get("results", []):
+                yield flow
+
+            paging = data.get("paging") or {}
+            next_page = paging.get("next") if isinstance(paging, dict) else None
+            after = next_page.get("after") if isinstance(next_page, dict) else None
+            if not after:
+                break
+            params["after"] = after
+
+    async def list_flows(self) -> list:
+        """
+        List all automation flows with pagination.
+
+        Returns:
+            List of flow summary dicts.
+        """
+        return [flow async for flow in self.iter_flows()]
+
+    async def get_flow(self, flow_id: str) -> dict:
+        """
+        Get full details of a flow.
+
+        Args:
+            flow_id: HubSpot flow ID.
+
+        Returns:
+            Flow details dict.
+        """
+        url = f"{self.base_url}/automation/v4/flows/{flow_id}"
+        resp = await self._request("GET", url)
+        return resp.json()
+
+    async def update_flow(self, flow_id: str, body: dict) -> dict:
+        """
+        Update a flow configuration.
+
+        Args:
+            flow_id: HubSpot flow ID.
+            body: Flow configuration to apply.
+
+        Returns:
+            Updated flow dict.
+        """
+        url = f"{self.base_url}/automation/v4/flows/{flow_id}"
+        resp = await self._request("PUT", url, json=body)
+        return resp.json()
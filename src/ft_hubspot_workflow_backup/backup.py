@@ -1,19 +1,45 @@
 import argparse
+import asyncio
 import hashlib
 import json
 import re
+import shutil
+import signal
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Union
 
-import requests
+from .catalog import Catalog, catalog_path
+from .metrics import Metrics, report_path, track_stage
+from .serialize import STYLES
+from .snapshot import INDEX_NAME, load_index
+from .storage import JOURNAL_NAME, ArchiveStore, ContentStore, FileStore, Journal, atomic_write
+from .verify import verify_backups
 
-from .client import HubSpotClient
+if TYPE_CHECKING:
+    from .async_client import AsyncHubSpotClient
+    from .client import HubSpotClient
+
+ARCHIVE_NAME = "workflows.zip"
+# "flat": <slug>.json in the run directory. "id" and "hashed" name files
+# <id>-<slug>.json, which is unique per flow, inside a shard subdirectory.
+LAYOUTS = ("flat", "id", "hashed")
+DEFAULT_WATCH_INTERVAL = 300.0
 
 
 def get_filter_sort_key(f: dict) -> tuple:
     """Get a sort key for a filter based on property, type, and value."""
+    try:
+        # Fast path for complete filters; same key as the general case below.
+        operation = f["operation"]
+        return (f["property"], f["filterType"], operation.get("value") or str(operation["values"]))
+    except KeyError:
+        pass
     operation = f.get("operation", {})
     op_value = operation.get("value", "") or str(operation.get("values", []))
     return (
@@ -25,36 +51,47 @@ def get_filter_sort_key(f: dict) -> tuple:
 
 def get_filter_branch_sort_key(branch: dict) -> tuple:
     """Get a sort key for a filter branch based on its first filter."""
-    filters = branch.get("filters", [])
+    filters = branch.get("filters")
     if filters:
-        first_filter = filters[0]
-        operation = first_filter.get("operation", {})
-        op_value = operation.get("value", "") or str(operation.get("values", []))
-        return (
-            first_filter.get("property", ""),
-            first_filter.get("filterType", ""),
-            op_value,
-        )
+        return get_filter_sort_key(filters[0])
     return ("", "", "")
 
 
 def sort_filters(obj: dict | list) -> dict | list:
-    """Recursively sort filters and filter branches for consistent output."""
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            if key == "filters" and isinstance(value, list):
-                obj[key] = sorted(value, key=get_filter_sort_key)
-            elif key == "reEnrollmentTriggersFilterBranches" and isinstance(
-                value, list
-            ):
-                for branch in value:
-                    sort_filters(branch)
-                obj[key] = sorted(value, key=get_filter_branch_sort_key)
-            else:
-                sort_filters(value)
-    elif isinstance(obj, list):
-        for item in obj:
-            sort_filters(item)
+    """
+    Sort filters and filter branches at any depth for consistent output.
+
+    Walks the structure with an explicit stack, so arbitrarily deep filter
+    branch trees don't hit the recursion limit. Scalars are never pushed
+    and the contents of a "filters" list are not descended into.
+    reEnrollmentTriggersFilterBranches are sorted after their branches,
+    since their sort key reads each branch's sorted filters.
+    """
+    # Stack items are containers to visit, or (dict, key) pairs whose
+    # branch list is sorted once everything above them has been visited.
+    stack = [obj]
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        item = pop()
+        if isinstance(item, dict):
+            for key, value in item.items():
+                if isinstance(value, list):
+                    if key == "filters":
+                        item[key] = sorted(value, key=get_filter_sort_key)
+                        continue
+                    if key == "reEnrollmentTriggersFilterBranches":
+                        push((item, key))
+                    push(value)
+                elif isinstance(value, dict):
+                    push(value)
+        elif isinstance(item, list):
+            for child in item:
+                if isinstance(child, (dict, list)):
+                    push(child)
+        elif type(item) is tuple:
+            parent, key = item
+            parent[key] = sorted(parent[key], key=get_filter_branch_sort_key)
     return obj
 
 
@@ -106,137 +143,955 @@ def get_timestamp() -> str:
     return datetime.now(timezone.utc).strftime("%Y_%m_%d_%H%M%S")
 
 
+def _resolve_output_dir(output_dir: Optional[Union[str, Path]]) -> Path:
+    """Return the snapshot output root, defaulting to ./snapshots/."""
+    if output_dir is None:
+        return Path.cwd() / "snapshots"
+    return Path(output_dir)
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Check whether an HTTP error was a 404 (flow deleted after listing)."""
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code == 404
+
+
+def shard_dir(flow_id: str, layout: str) -> Optional[str]:
+    """
+    Get the subdirectory a flow's file is stored in for a layout.
+
+    Args:
+        flow_id: HubSpot flow ID.
+        layout: "flat", "id" or "hashed".
+
+    Returns:
+        None for "flat". For "id", the last three digits of the flow ID,
+        zero-padded. Flow IDs are sparse within a portal, so a prefix would
+        give nearly every flow its own directory; the low digits spread
+        flows over at most 1000 directories. For "hashed", the first two
+        hex digits of the ID's SHA-256, spreading flows evenly over 256
+        directories.
+    """
+    if layout == "flat":
+        return None
+    if layout == "id":
+        return flow_id[-3:].zfill(3)
+    if layout == "hashed":
+        return hashlib.sha256(flow_id.encode("utf-8")).hexdigest()[:2]
+    raise ValueError(f"Unknown layout: {layout}")
+
+
+def _flow_filename(
+    flow: dict, timestamp: str, use_date_prefix: bool, layout: str = "flat"
+) -> tuple:
+    """
+    Work out the ID, display name and backup filename for a flow summary.
+
+    Returns:
+        Tuple of (flow_id, name, filename), the filename relative to the
+        run directory.
+    """
+    flow_id = str(flow.get("id"))
+    name = flow.get("name") or f"flow-{flow_id}"
+    slug = slugify(name)
+
+    shard = None
+    if layout != "flat":
+        # IDs are numeric; keep anything else out of the path.
+        safe_id = re.sub(r"[^0-9A-Za-z_-]", "_", flow_id)
+        slug = f"{safe_id}-{slug}"
+        shard = shard_dir(safe_id, layout)
+
+    if use_date_prefix:
+        filename = f"{timestamp}_{slug}.json"
+    else:
+        filename = f"{slug}.json"
+    if shard is not None:
+        filename = f"{shard}/{filename}"
+    return flow_id, name, filename
+
+
+def _claim_filename(
+    flow: dict, store: FileStore, timestamp: str, use_date_prefix: bool
+) -> tuple:
+    """
+    Like _flow_filename, with the filename claimed in the store for this run.
+
+    Flows are claimed in list_flows order before they are handed to workers,
+    so which of two flows with the same filename gets a -<flow_id> suffix
+    does not depend on scheduling.
+    """
+    flow_id, name, filename = _flow_filename(flow, timestamp, use_date_prefix, store.layout)
+    return flow_id, name, store.claim(flow_id, filename)
+
+
+def _claim_filenames(
+    flows: Iterable[dict], store: FileStore, timestamp: str, use_date_prefix: bool
+) -> Iterator[dict]:
+    """Claim each flow's filename as its summary is taken from flows."""
+    for flow in flows:
+        _claim_filename(flow, store, timestamp, use_date_prefix)
+        yield flow
+
+
+def _backup_entry(
+    details: dict,
+    flow: dict,
+    store: FileStore,
+    timestamp: str,
+    use_date_prefix: bool,
+) -> dict:
+    """
+    Normalize a flow and write it to the store.
+
+    Args:
+        details: Flow details from get_flow.
+        flow: Flow summary dict from list_flows.
+        store: FileStore (or subclass) receiving the flow.
+        timestamp: Run timestamp used for date-prefixed filenames.
+        use_date_prefix: If True, prefix the filename with timestamp.
+
+    Returns:
+        Index entry dict.
+    """
+    flow_id, name, filename = _claim_filename(flow, store, timestamp, use_date_prefix)
+
+    with track_stage(store.metrics, "normalize"):
+        details = normalize_flow(details)
+    location = store.write(filename, details)
+
+    entry = {
+        "id": flow_id,
+        "name": name,
+        "filename": location["filename"],
+        "isEnabled": details.get("isEnabled"),
+        "flowType": details.get("flowType"),
+        "type": details.get("type"),
+        "revisionId": details.get("revisionId", flow.get("revisionId")),
+        "updatedAt": details.get("updatedAt", flow.get("updatedAt")),
+    }
+    if "hash" in location:
+        entry["hash"] = location["hash"]
+    return entry
+
+
+def _find_previous_index(
+    output_dir: Path, snapshot: Path, use_date_dir: bool
+) -> Optional[tuple]:
+    """
+    Locate the most recent completed run to compare against.
+
+    Args:
+        output_dir: Snapshot output root.
+        snapshot: Snapshot path of the current run (excluded when dated).
+        use_date_dir: Whether runs live in timestamped subdirectories or archives.
+
+    Returns:
+        Tuple of (snapshot path, index dict), or None if there is no previous run.
+    """
+    if use_date_dir:
+        candidates = sorted(
+            (
+                p for p in output_dir.iterdir()
+                if p != snapshot and (p.is_dir() or p.suffix == ".zip")
+            ),
+            key=lambda p: p.name,
+            reverse=True,
+        )
+    else:
+        candidates = [output_dir, output_dir / ARCHIVE_NAME]
+
+    for candidate in candidates:
+        try:
+            return candidate, load_index(candidate)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return None
+
+
+def _find_interrupted_run(output_dir: Path, use_date_dir: bool) -> Optional[Path]:
+    """
+    Locate the run directory of the most recent interrupted backup.
+
+    A run is interrupted if its journal is still present. Dated runs that
+    already have an _index.json completed and are ignored.
+
+    Returns:
+        Run directory holding the journal, or None.
+    """
+    if not use_date_dir:
+        return output_dir if (output_dir / JOURNAL_NAME).is_file() else None
+    if not output_dir.is_dir():
+        return None
+    candidates = sorted(
+        (
+            p for p in output_dir.iterdir()
+            if (p / JOURNAL_NAME).is_file() and not (p / INDEX_NAME).exists()
+        ),
+        key=lambda p: p.name,
+        reverse=True,
+    )
+    return candidates[0] if candidates else None
+
+
+def _discard_partial_run(output_dir: Path, since: str) -> None:
+    """
+    Remove a dated run started at or after since that never got its index.
+
+    watch_flows never resumes a failed cycle and retention only sees
+    completed runs, so its directory would otherwise stay forever.
+    """
+    run = _find_interrupted_run(output_dir, use_date_dir=True)
+    if run is not None and run.name >= since:
+        shutil.rmtree(run, ignore_errors=True)
+
+
+def _is_unchanged(flow: dict, previous: Optional[dict]) -> bool:
+    """Check whether a flow summary matches its entry in a previous index."""
+    if not previous or not previous.get("hash"):
+        return False
+    revision = flow.get("revisionId")
+    if revision is None or str(revision) != str(previous.get("revisionId")):
+        return False
+    updated_at = flow.get("updatedAt")
+    if updated_at is not None and previous.get("updatedAt") is not None:
+        return updated_at == previous["updatedAt"]
+    return True
+
+
+def _carry_forward(
+    previous: dict,
+    previous_snapshot: Path,
+    flow: dict,
+    store: FileStore,
+    timestamp: str,
+    use_date_prefix: bool,
+) -> Optional[dict]:
+    """
+    Reuse an unchanged flow from a previous run.
+
+    Returns:
+        Index entry dict, or None if the previous file is missing.
+    """
+    flow_id, name, filename = _claim_filename(flow, store, timestamp, use_date_prefix)
+    with track_stage(store.metrics, "carry_forward"):
+        location = store.carry_forward(filename, previous, previous_snapshot)
+    if location is None:
+        return None
+
+    entry = dict(previous)
+    entry.update({"id": flow_id, "name": name, **location})
+    return entry
+
+
+def _backup_flow(
+    client: "HubSpotClient",
+    flow: dict,
+    store: FileStore,
+    timestamp: str,
+    use_date_prefix: bool,
+) -> Optional[dict]:
+    """
+    Fetch, normalize and write a single flow.
+
+    Returns:
+        Index entry dict, or None if the flow was deleted after listing.
+    """
+    import requests
+
+    try:
+        with track_stage(store.metrics, "fetch"):
+            details = client.get_flow(str(flow.get("id")))
+    except requests.exceptions.HTTPError as e:
+        if _is_not_found(e):
+            return None
+        raise
+    return _backup_entry(details, flow, store, timestamp, use_date_prefix)
+
+
+def _open_store(
+    output_format: str,
+    output_dir: Path,
+    use_date_dir: bool,
+    timestamp: str,
+    fsync: bool = False,
+    metrics: Optional[Metrics] = None,
+    json_style: str = "indent",
+    layout: str = "flat",
+) -> FileStore:
+    """
+    Create the run directory and store for an output format.
+
+    Archives are written straight into output_dir, named after the run
+    timestamp when use_date_dir is set.
+    """
+    if json_style not in STYLES:
+        raise ValueError(f"Unknown JSON style: {json_style}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+    options = {"fsync": fsync, "metrics": metrics, "json_style": json_style, "layout": layout}
+    if output_format == "archive":
+        output_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{timestamp}.zip" if use_date_dir else ARCHIVE_NAME
+        return ArchiveStore(output_dir / name, timestamp, **options)
+
+    run_dir = output_dir / timestamp if use_date_dir else output_dir
+    if output_format == "files":
+        run_dir.mkdir(parents=True, exist_ok=True)
+        return FileStore(run_dir, **options)
+    if output_format == "cas":
+        run_dir.mkdir(parents=True, exist_ok=True)
+        return ContentStore(run_dir, output_dir / "objects", **options)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+def _timed_iter(iterable: Iterable, metrics: Optional[Metrics], stage: str) -> Iterator:
+    """Yield from iterable, timing each step (e.g. a page fetch) as a stage."""
+    iterator = iter(iterable)
+    while True:
+        with track_stage(metrics, stage):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def _pipeline(
+    flows: Iterable[dict],
+    backup_one: Callable[[dict], Optional[dict]],
+    max_workers: int,
+    on_flow: Optional[Callable[[dict], None]] = None,
+) -> list:
+    """
+    Back up flows on a thread pool as their summaries arrive.
+
+    At most 2 * max_workers flows are queued or in flight; when the window
+    is full the oldest result is awaited before the next summary is taken,
+    which also pauses paging. Results keep the order of flows.
+    """
+    window = 2 * max_workers
+    results = []
+    pending: deque = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for flow in flows:
+                if on_flow is not None:
+                    on_flow(flow)
+                pending.append(executor.submit(backup_one, flow))
+                if len(pending) >= window:
+                    results.append(pending.popleft().result())
+            while pending:
+                results.append(pending.popleft().result())
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+    return results
+
+
+def _record_in_catalog(
+    catalog: Optional[Union[str, Path, Catalog]],
+    snapshot: Path,
+    store: FileStore,
+    timestamp: str,
+    index_entries: list,
+) -> None:
+    """Add a finished run to the catalog, opening it if given as a path."""
+    if catalog is None:
+        return
+    index = {"timestamp": timestamp, "flows": index_entries, "format": store.format}
+    if isinstance(catalog, Catalog):
+        catalog.add_run(snapshot, index)
+        return
+    with Catalog(catalog) as opened:
+        opened.add_run(snapshot, index)
+
+
+def _write_metrics_report(metrics: Optional[Metrics], snapshot: Path, started: float) -> None:
+    """Record the run's wall time and write the metrics report next to the index."""
+    if metrics is None:
+        return
+    metrics.observe_stage("backup", time.perf_counter() - started)
+    metrics.write_json(report_path(snapshot))
+
+
 def backup_all_flows(
     token: Optional[str] = None,
     output_dir: Optional[Union[str, Path]] = None,
-    client: Optional[HubSpotClient] = None,
+    client: Optional["HubSpotClient"] = None,
     use_date_dir: bool = False,
     use_date_prefix: bool = False,
+    max_workers: int = 1,
+    incremental: bool = False,
+    output_format: str = "files",
+    fsync: bool = False,
+    metrics: Optional[Metrics] = None,
+    on_flow: Optional[Callable[[dict], None]] = None,
+    resume: bool = False,
+    catalog: Optional[Union[str, Path, Catalog]] = None,
+    json_style: str = "indent",
+    summaries: Optional[Iterable[dict]] = None,
+    layout: str = "flat",
 ) -> Path:
     """
     Backup all HubSpot automation flows to JSON files.
 
+    Flow summaries are streamed page by page from iter_flows and each flow
+    is fetched, normalized and written as soon as its summary arrives, so
+    paging overlaps with detail fetches.
+
     Args:
         token: HubSpot token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
         output_dir: Directory for snapshots. Defaults to ./snapshots/.
         client: Pre-configured HubSpotClient instance.
         use_date_dir: If True, create a timestamped subdirectory for this run.
         use_date_prefix: If True, prefix each workflow filename with timestamp.
+        max_workers: Number of flows to fetch and write concurrently.
+            Index order always follows list_flows order.
+        incremental: If True, only fetch flows whose revisionId/updatedAt
+            changed since the previous run's _index.json; unchanged flows
+            reuse the previous file and hash.
+        output_format: "files" writes one JSON file per flow into the run
+            directory. "cas" stores each distinct flow body once under
+            <output_dir>/objects/ by SHA-256 and makes _index.json a manifest
+            pointing at those blobs. "archive" writes the run into a single
+            zip (<timestamp>.zip with use_date_dir, else workflows.zip) whose
+            members can be read individually.
+        fsync: If True, flush all written files to disk in one batch before
+            _index.json is committed. Files are always written atomically.
+        metrics: Metrics collector for stage timings. Defaults to the
+            client's. When set, the run's metrics are written as JSON next
+            to _index.json (see metrics.report_path).
+        on_flow: Called with each flow summary as it is listed, e.g. to
+            report progress.
+        resume: If True, continue the most recent interrupted run (one whose
+            _journal.jsonl is still present) in its own run directory:
+            flows it completed are reused if their revision is unchanged,
+            only the rest are fetched. Starts a new run if there is none.
+            Not supported for the "archive" format.
+        catalog: Catalog, or path to a catalog database, to record the run
+            in (see catalog.catalog_path for the default location).
+        json_style: "indent" writes 2-space indented flow files. "compact"
+            writes them without whitespace, which is smaller but hashes
+            differently; the style is recorded in _index.json, and
+            incremental runs only reuse files written in the same style.
+        summaries: Flow summaries to back up instead of listing them with
+            the client, e.g. a listing watch_flows already made.
+        layout: "flat" writes <slug>.json into the run directory; of flows
+            whose names slugify alike, all but the first listed get
+            <slug>-<id>.json (see FileStore.claim). "id" and
+            "hashed" write <id>-<slug>.json, unique per flow, into
+            subdirectories (see shard_dir) to keep directories small.
+            Recorded in _index.json; verify, diff and restore resolve
+            files through the index. Has no effect on the "cas" format.
 
     Returns:
-        Path to the created snapshot directory.
+        Path to the created snapshot directory, or archive file.
     """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+    if resume and output_format == "archive":
+        raise ValueError("resume is not supported for the archive format.")
+
     if client is None:
-        client = HubSpotClient(token=token)
+        from .client import HubSpotClient
 
+        client = HubSpotClient(token=token, pool_size=max_workers, metrics=metrics)
+    if metrics is None:
+        metrics = client.metrics
+
+    started = time.perf_counter()
     timestamp = get_timestamp()
+    output_dir = _resolve_output_dir(output_dir)
 
-    if output_dir is None:
-        output_dir = Path.cwd() / "snapshots"
-    else:
-        output_dir = Path(output_dir)
+    journaled: dict = {}
+    interrupted = _find_interrupted_run(output_dir, use_date_dir) if resume else None
+    if interrupted is not None:
+        header, journaled = Journal.read(interrupted / JOURNAL_NAME)
+        journal_format = header.get("format", output_format)
+        if journal_format != output_format:
+            raise ValueError(
+                f"Cannot resume {interrupted}: it was written with format "
+                f"'{journal_format}', not '{output_format}'."
+            )
+        journal_style = header.get("style", "indent")
+        if journal_style != json_style:
+            raise ValueError(
+                f"Cannot resume {interrupted}: it was written with JSON style "
+                f"'{journal_style}', not '{json_style}'."
+            )
+        journal_layout = header.get("layout", "flat")
+        if journal_layout != layout:
+            raise ValueError(
+                f"Cannot resume {interrupted}: it was written with layout "
+                f"'{journal_layout}', not '{layout}'."
+            )
+        timestamp = header.get("timestamp", timestamp)
 
-    if use_date_dir:
-        run_dir = output_dir / timestamp
+    store = _open_store(
+        output_format, output_dir, use_date_dir, timestamp,
+        fsync=fsync, metrics=metrics, json_style=json_style, layout=layout,
+    )
+    journal = None
+    if output_format != "archive":
+        journal = Journal(store.run_dir / JOURNAL_NAME, fsync=fsync)
+        journal.start(
+            timestamp, output_format, resume=interrupted is not None,
+            json_style=json_style, layout=layout,
+        )
+
+    previous_snapshot = None
+    previous_entries: dict = {}
+    if incremental:
+        found = _find_previous_index(output_dir, store.snapshot_path, use_date_dir)
+        if found and found[1].get("style", "indent") == json_style:
+            previous_snapshot, previous_index = found
+            previous_entries = {
+                str(entry.get("id")): entry
+                for entry in previous_index.get("flows", [])
+            }
+
+    def backup_flow(flow: dict) -> Optional[dict]:
+        flow_id = str(flow.get("id"))
+        done = journaled.get(flow_id)
+        if _is_unchanged(flow, done) and store.resume_entry(done):
+            return done
+        previous = previous_entries.get(flow_id)
+        if _is_unchanged(flow, previous):
+            entry = _carry_forward(
+                previous, previous_snapshot, flow, store, timestamp, use_date_prefix
+            )
+            if entry is not None:
+                return entry
+        return _backup_flow(client, flow, store, timestamp, use_date_prefix)
+
+    def backup_one(flow: dict) -> Optional[dict]:
+        entry = backup_flow(flow)
+        if entry is not None and journal is not None:
+            journal.append(entry)
+        return entry
+
+    # Files reused from the interrupted run keep the names they were written under.
+    for entry in journaled.values():
+        if entry.get("filename"):
+            store.claim(str(entry["id"]), entry["filename"])
+
+    if summaries is None:
+        flows = _timed_iter(client.iter_flows(), metrics, "list")
     else:
-        run_dir = output_dir
-    run_dir.mkdir(parents=True, exist_ok=True)
+        flows = iter(summaries)
+    flows = _claim_filenames(flows, store, timestamp, use_date_prefix)
+    try:
+        if max_workers == 1:
+            results = []
+            for flow in flows:
+                if on_flow is not None:
+                    on_flow(flow)
+                results.append(backup_one(flow))
+        else:
+            results = _pipeline(flows, backup_one, max_workers, on_flow)
+    except BaseException:
+        if journal is not None:
+            journal.close()
+        store.abort()
+        raise
 
-    flows = client.list_flows()
+    if not results:
+        if journal is not None:
+            journal.remove()
+        store.abort()
+        return store.run_dir
 
-    if not flows:
-        return run_dir
+    index_entries = [entry for entry in results if entry is not None]
+    with track_stage(metrics, "index"):
+        snapshot = store.write_index(timestamp, index_entries)
+    if journal is not None:
+        journal.remove()
+    _record_in_catalog(catalog, snapshot, store, timestamp, index_entries)
+    _write_metrics_report(metrics, snapshot, started)
+    return snapshot
 
-    index_entries = []
 
-    for flow in flows:
-        flow_id = str(flow.get("id"))
-        name = flow.get("name") or f"flow-{flow_id}"
-        slug = slugify(name)
+async def async_backup_all_flows(
+    token: Optional[str] = None,
+    output_dir: Optional[Union[str, Path]] = None,
+    client: Optional["AsyncHubSpotClient"] = None,
+    use_date_dir: bool = False,
+    use_date_prefix: bool = False,
+    max_concurrency: int = 10,
+    output_format: str = "files",
+    metrics: Optional[Metrics] = None,
+    on_flow: Optional[Callable[[dict], None]] = None,
+    catalog: Optional[Union[str, Path, Catalog]] = None,
+    json_style: str = "indent",
+    layout: str = "flat",
+) -> Path:
+    """
+    Backup all HubSpot automation flows to JSON files using asyncio.
 
-        try:
-            details = client.get_flow(flow_id)
-        except requests.exceptions.HTTPError:
-            continue
+    Like backup_all_flows, flows are fetched as their summaries are paged
+    in; paging waits while max_concurrency fetches are in flight. Flows are
+    normalized and written in the default thread pool, so disk I/O never
+    stalls the fetches.
 
-        details = normalize_flow(details)
+    Args:
+        token: HubSpot token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
+        output_dir: Directory for snapshots. Defaults to ./snapshots/.
+        client: Pre-configured AsyncHubSpotClient instance.
+        use_date_dir: If True, create a timestamped subdirectory for this run.
+        use_date_prefix: If True, prefix each workflow filename with timestamp.
+        max_concurrency: Maximum number of flow fetches in flight.
+            Index order always follows list_flows order.
+        output_format: "files", "cas" or "archive", as for backup_all_flows.
+        metrics: Metrics collector, as for backup_all_flows.
+        on_flow: Called with each flow summary as it is listed.
+        catalog: Catalog, or path to a catalog database, as for backup_all_flows.
+        json_style: "indent" or "compact", as for backup_all_flows.
+        layout: "flat", "id" or "hashed", as for backup_all_flows.
 
-        if use_date_prefix:
-            filename = f"{timestamp}_{slug}.json"
-        else:
-            filename = f"{slug}.json"
-        filepath = run_dir / filename
+    Returns:
+        Path to the created snapshot directory, or archive file.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
 
-        with filepath.open("w", encoding="utf-8") as f:
-            json.dump(details, f, indent=2, sort_keys=True)
+    owns_client = client is None
+    if client is None:
+        from .async_client import AsyncHubSpotClient
+
+        client = AsyncHubSpotClient(token=token, pool_size=max_concurrency, metrics=metrics)
+    if metrics is None:
+        metrics = client.metrics
 
-        index_entries.append({
-            "id": flow_id,
-            "name": name,
-            "filename": filename,
-            "isEnabled": details.get("isEnabled"),
-            "flowType": details.get("flowType"),
-            "type": details.get("type"),
-        })
+    started = time.perf_counter()
+    timestamp = get_timestamp()
+    store = _open_store(
+        output_format, _resolve_output_dir(output_dir), use_date_dir, timestamp,
+        metrics=metrics, json_style=json_style, layout=layout,
+    )
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def backup_one(flow: dict) -> Optional[dict]:
+        try:
+            with track_stage(metrics, "fetch"):
+                details = await client.get_flow(str(flow.get("id")))
+        except Exception as e:
+            if _is_not_found(e):
+                return None
+            raise
+        finally:
+            semaphore.release()
+        # Normalizing, hashing and writing block; keep them off the event loop.
+        return await asyncio.to_thread(
+            _backup_entry, details, flow, store, timestamp, use_date_prefix
+        )
 
-    for entry in index_entries:
-        filepath = run_dir / entry["filename"]
-        content = filepath.read_bytes()
-        entry["hash"] = hashlib.sha256(content).hexdigest()
+    tasks: list = []
+    flows = client.iter_flows()
+    try:
+        while True:
+            with track_stage(metrics, "list"):
+                try:
+                    flow = await flows.__anext__()
+                except StopAsyncIteration:
+                    break
+            if on_flow is not None:
+                on_flow(flow)
+            _claim_filename(flow, store, timestamp, use_date_prefix)
+            await semaphore.acquire()
+            tasks.append(asyncio.ensure_future(backup_one(flow)))
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        store.abort()
+        raise
+    finally:
+        if owns_client:
+            await client.aclose()
 
-    index_path = run_dir / "_index.json"
-    with index_path.open("w", encoding="utf-8") as f:
-        json.dump({
-            "timestamp": timestamp,
-            "flows": index_entries,
-        }, f, indent=2)
+    if not results:
+        store.abort()
+        return store.run_dir
 
-    return run_dir
+    index_entries = [entry for entry in results if entry is not None]
+    with track_stage(metrics, "index"):
+        snapshot = store.write_index(timestamp, index_entries)
+    _record_in_catalog(catalog, snapshot, store, timestamp, index_entries)
+    _write_metrics_report(metrics, snapshot, started)
+    return snapshot
 
 
-def verify_backups(snapshot_dir: Optional[Union[str, Path]] = None) -> dict:
+def watch_flows(
+    token: Optional[str] = None,
+    output_dir: Optional[Union[str, Path]] = None,
+    client: Optional["HubSpotClient"] = None,
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    use_date_prefix: bool = False,
+    max_workers: int = 1,
+    output_format: str = "files",
+    fsync: bool = False,
+    metrics: Optional[Metrics] = None,
+    catalog: Optional[Union[str, Path, Catalog]] = None,
+    json_style: str = "indent",
+    layout: str = "flat",
+    on_cycle: Optional[Callable[[dict], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+    max_cycles: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+) -> Optional[Path]:
     """
-    Verify all workflow backups against their stored SHA-256 hashes.
+    Keep backing up flows as they change, polling the flow list.
+
+    Each cycle pages through the flow summaries once and compares every
+    flow's revisionId/updatedAt with the last known revision, kept in
+    memory and seeded from the newest snapshot under output_dir. Cycles
+    without changes cost only the list requests and write nothing. When
+    flows changed or were deleted, a new dated snapshot is written like
+    an incremental backup_all_flows run from the same listing: only the
+    changed flows are fetched and the rest are carried forward, so every
+    snapshot is complete and works with verify, diff and restore.
 
     Args:
-        snapshot_dir: Directory containing snapshots. Defaults to ./snapshots/.
+        token: HubSpot token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
+        output_dir: Directory for snapshots. Defaults to ./snapshots/.
+        client: Pre-configured HubSpotClient instance.
+        interval: Seconds to wait between cycles (at least 1, so dated
+            snapshot names never collide).
+        use_date_prefix: If True, prefix each workflow filename with timestamp.
+        max_workers: Number of changed flows to fetch concurrently.
+        output_format: "files", "cas" or "archive", as for backup_all_flows.
+        fsync: If True, flush written files before each index is committed.
+        metrics: Metrics collector, as for backup_all_flows. Accumulates
+            across cycles.
+        catalog: Catalog, or path to a catalog database, to record each
+            snapshot in.
+        json_style: "indent" or "compact", as for backup_all_flows.
+        layout: "flat", "id" or "hashed", as for backup_all_flows.
+        on_cycle: Called after every cycle with a dict of cycle (number),
+            listed (flow count), changed and removed (flow ID lists) and
+            snapshot (new snapshot path, or None).
+        on_error: Called with the exception when a cycle fails with a
+            network or file system error; the partial snapshot is removed
+            and the next cycle tries again.
+        max_cycles: Stop after this many cycles. Defaults to running until
+            stop is set.
+        stop: Event that ends the watch when set, also during the wait.
 
     Returns:
-        Dict with 'verified', 'failed', and 'missing' lists of filenames.
+        Path to the newest snapshot written, or None if nothing changed.
     """
-    if snapshot_dir is None:
-        snapshot_path = Path.cwd() / "snapshots"
-    else:
-        snapshot_path = Path(snapshot_dir)
-
-    index_path = snapshot_path / "_index.json"
-    if not index_path.exists():
-        raise FileNotFoundError(f"Index file not found: {index_path}")
+    import requests
 
-    with index_path.open("r", encoding="utf-8") as f:
-        index = json.load(f)
+    if interval < 1:
+        raise ValueError("interval must be at least 1 second.")
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+    if json_style not in STYLES:
+        raise ValueError(f"Unknown JSON style: {json_style}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
 
-    results: dict = {"verified": [], "failed": [], "missing": []}
+    if client is None:
+        from .client import HubSpotClient
 
-    for flow in index.get("flows", []):
-        filename = flow.get("filename")
-        expected_hash = flow.get("hash")
+        client = HubSpotClient(token=token, pool_size=max_workers, metrics=metrics)
+    if metrics is None:
+        metrics = client.metrics
+    if stop is None:
+        stop = threading.Event()
 
-        if not filename or not expected_hash:
-            continue
+    output_dir = _resolve_output_dir(output_dir)
+    known: dict = {}
+    if output_dir.is_dir():
+        found = _find_previous_index(output_dir, output_dir, use_date_dir=True)
+        if found and found[1].get("style", "indent") == json_style:
+            known = {str(entry.get("id")): entry for entry in found[1].get("flows", [])}
 
-        filepath = snapshot_path / filename
-        if not filepath.exists():
-            results["missing"].append(filename)
-            continue
+    latest = None
+    cycle = 0
+    while not stop.is_set():
+        cycle += 1
+        try:
+            summaries = list(_timed_iter(client.iter_flows(), metrics, "list"))
+            listed = {str(flow.get("id")) for flow in summaries}
+            changed = [
+                str(flow.get("id")) for flow in summaries
+                if not _is_unchanged(flow, known.get(str(flow.get("id"))))
+            ]
+            removed = sorted(set(known) - listed)
 
-        actual_hash = hashlib.sha256(filepath.read_bytes()).hexdigest()
-        if actual_hash == expected_hash:
-            results["verified"].append(filename)
+            snapshot = None
+            if not summaries:
+                known = {}
+            elif changed or removed:
+                started = get_timestamp()
+                try:
+                    snapshot = backup_all_flows(
+                        client=client,
+                        output_dir=output_dir,
+                        use_date_dir=True,
+                        use_date_prefix=use_date_prefix,
+                        max_workers=max_workers,
+                        incremental=True,
+                        output_format=output_format,
+                        fsync=fsync,
+                        metrics=metrics,
+                        catalog=catalog,
+                        json_style=json_style,
+                        summaries=summaries,
+                        layout=layout,
+                    )
+                except BaseException:
+                    _discard_partial_run(output_dir, started)
+                    raise
+                known = {
+                    str(entry.get("id")): entry
+                    for entry in load_index(snapshot).get("flows", [])
+                }
+                latest = snapshot
+        except (requests.RequestException, OSError) as e:
+            if on_error is not None:
+                on_error(e)
         else:
-            results["failed"].append(filename)
+            if on_cycle is not None:
+                on_cycle({
+                    "cycle": cycle,
+                    "listed": len(summaries),
+                    "changed": changed,
+                    "removed": removed,
+                    "snapshot": snapshot,
+                })
 
-    return results
+        if max_cycles is not None and cycle >= max_cycles:
+            break
+        stop.wait(interval)
+    return latest
+
+
+def _watch_cli(args: argparse.Namespace, client: "HubSpotClient", metrics: Optional[Metrics]) -> None:
+    """Run workflows-backup --watch until interrupted."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+    def on_cycle(result: dict) -> None:
+        stamp = get_timestamp()
+        if result["snapshot"] is None:
+            print(f"[{stamp}] {result['listed']} flows, no changes")
+            return
+        print(
+            f"[{stamp}] {result['listed']} flows, {len(result['changed'])} changed, "
+            f"{len(result['removed'])} removed -> {result['snapshot']}"
+        )
+        if metrics is not None and args.metrics_textfile:
+            metrics.write_prometheus(args.metrics_textfile)
+        if args.verify:
+            verified = verify_backups(result["snapshot"], max_workers=args.workers)
+            if verified["failed"]:
+                print(f"  Verification failed: {', '.join(verified['failed'])}", file=sys.stderr)
+
+    def on_error(error: Exception) -> None:
+        print(f"[{get_timestamp()}] Error: {error}", file=sys.stderr)
+
+    print(f"Watching HubSpot automation flows every {args.interval:g}s (Ctrl+C to stop)...\n")
+    try:
+        watch_flows(
+            client=client,
+            output_dir=args.output_dir,
+            interval=args.interval,
+            use_date_prefix=args.use_date_prefix,
+            max_workers=args.workers,
+            output_format=args.output_format,
+            fsync=args.fsync,
+            catalog=catalog_path(_resolve_output_dir(args.output_dir)) if args.catalog else None,
+            json_style=args.json_style,
+            layout=args.layout,
+            on_cycle=on_cycle,
+            on_error=on_error,
+            stop=stop,
+        )
+    except KeyboardInterrupt:
+        pass
+    print("Stopped watching.")
+
+
+def _given_options(parser: argparse.ArgumentParser, dests: Iterable[str]) -> dict:
+    """
+    Find which options were given on the command line, even at their default.
+
+    The command line is parsed again with the defaults of dests replaced by
+    a sentinel, so only options actually given end up in the result.
+
+    Args:
+        parser: The parser that already parsed the command line.
+        dests: argparse destinations to look for.
+
+    Returns:
+        Dict mapping each given destination to its parsed value.
+    """
+    missing = object()
+    saved = {dest: parser.get_default(dest) for dest in dests}
+    parser.set_defaults(**dict.fromkeys(saved, missing))
+    try:
+        namespace = parser.parse_args()
+    finally:
+        parser.set_defaults(**saved)
+    return {
+        dest: value for dest, value in vars(namespace).items()
+        if dest in saved and value is not missing
+    }
+
+
+def _backup_portals_cli(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    """Run workflows-backup --portals and print the combined summary."""
+    from .portals import backup_portals
+
+    # Portal option -> argparse dest. Flags given on the command line
+    # override the config's defaults; per-portal keys still win over them.
+    flags = {
+        "use_date_dir": "use_date_dir",
+        "use_date_prefix": "use_date_prefix",
+        "max_workers": "workers",
+        "incremental": "incremental",
+        "output_format": "output_format",
+        "fsync": "fsync",
+        "resume": "resume",
+        "json_style": "json_style",
+        "layout": "layout",
+        "catalog": "catalog",
+        "metrics": "metrics",
+        "verify": "verify",
+    }
+    given = _given_options(parser, flags.values())
+    overrides = {option: given[dest] for option, dest in flags.items() if dest in given}
+    try:
+        results = backup_portals(args.portals, max_processes=args.processes, overrides=overrides)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    width = max(len("Portal"), *(len(r["name"]) for r in results))
+    print(f"{'Portal':<{width}}  {'Status':<6}  {'Flows':>6}  {'Seconds':>8}  Snapshot")
+    for r in results:
+        print(
+            f"{r['name']:<{width}}  {r['status']:<6}  {r['flows']:>6}  "
+            f"{r['seconds']:>8.1f}  {r['snapshot'] or '-'}"
+        )
+        if r.get("error"):
+            print(f"{'':<{width}}  error: {r['error']}")
+
+    failed = [r for r in results if r["status"] != "ok"]
+    print(f"\nPortals: {len(results)}, succeeded: {len(results) - len(failed)}, failed: {len(failed)}")
+    print(f"Total flows: {sum(r['flows'] for r in results)}")
+
+    if args.summary:
+        atomic_write(Path(args.summary), json.dumps(results, indent=2).encode("utf-8"))
+        print(f"Summary saved to: {args.summary}")
+    if failed:
+        sys.exit(1)
 
 
 def main() -> None:
@@ -252,52 +1107,213 @@ def main() -> None:
     )
     parser.add_argument(
         "--use-date-dir",
-        action="store_true",
+        action=argparse.BooleanOptionalAction,
+        default=False,
         help="Create a timestamped subdirectory for this backup run"
     )
     parser.add_argument(
         "--use-date-prefix",
-        action="store_true",
+        action=argparse.BooleanOptionalAction,
+        default=False,
         help="Prefix each workflow filename with a timestamp"
     )
     parser.add_argument(
         "--verify",
-        action="store_true",
+        action=argparse.BooleanOptionalAction,
+        default=False,
         help="Verify backup integrity after completion"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of flows to fetch concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Only fetch flows that changed since the previous backup run"
+    )
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=["files", "cas", "archive"],
+        default="files",
+        help="Output format: one file per flow, a content-addressed object "
+             "store shared across runs, or one zip archive per run "
+             "(default: files)"
+    )
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default="flat",
+        help="File layout: flat <slug>.json files, or <id>-<slug>.json files "
+             "(always unique) sharded into directories by the ID's last three "
+             "digits (id) or by hash (hashed) (default: flat)"
+    )
+    parser.add_argument(
+        "--compact",
+        dest="json_style",
+        action="store_const",
+        const="compact",
+        default="indent",
+        help="Write flow files as compact JSON without whitespace; hashes "
+             "differ from the default indented files"
+    )
+    parser.add_argument(
+        "--indent",
+        dest="json_style",
+        action="store_const",
+        const="indent",
+        help="Write flow files as 2-space indented JSON (the default); "
+             "overrides a compact --portals config"
+    )
+    parser.add_argument(
+        "--fsync",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Flush written files to disk before committing _index.json"
+    )
+    parser.add_argument(
+        "--resume",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Continue the most recent interrupted run, fetching only the "
+             "flows it had not finished (not supported with --format archive)"
+    )
+    parser.add_argument(
+        "--catalog",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Record the run in the snapshot catalog (<output-dir>/_catalog.sqlite) "
+             "for workflows-catalog queries"
+    )
+    parser.add_argument(
+        "--metrics",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Record request and stage metrics and write them next to _index.json"
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        metavar="PATH",
+        help="Also write the metrics as a Prometheus textfile (implies --metrics)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: poll the flow list every --interval seconds and write a "
+             "new dated snapshot, fetching only changed flows, whenever flows change"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        metavar="SECONDS",
+        help=f"Seconds between --watch polls (default: {DEFAULT_WATCH_INTERVAL:g})"
+    )
+    parser.add_argument(
+        "--portals",
+        metavar="CONFIG",
+        help="Back up every portal listed in a JSON config file, in parallel "
+             "processes; the other flags above given on the command line "
+             "override the config's defaults"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Maximum portals backed up at once with --portals "
+             "(default: number of portals, capped at the CPU count)"
+    )
+    parser.add_argument(
+        "--summary",
+        metavar="PATH",
+        help="Write the combined --portals summary as JSON to PATH"
+    )
     args = parser.parse_args()
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.resume and args.output_format == "archive":
+        parser.error("--resume is not supported with --format archive")
+    given = _given_options(parser, ["interval", "use_date_dir", "incremental"])
+    if args.watch:
+        if args.portals:
+            parser.error("--watch cannot be used with --portals")
+        if args.resume:
+            parser.error("--watch cannot be used with --resume")
+        # Both are implied; only turning them off contradicts --watch.
+        if given.get("use_date_dir") is False or given.get("incremental") is False:
+            parser.error("--watch cannot be used with --no-use-date-dir or --no-incremental")
+        if args.interval < 1:
+            parser.error("--interval must be at least 1 second")
+    elif "interval" in given:
+        parser.error("--interval requires --watch")
+    if args.portals:
+        if args.output_dir:
+            parser.error("--output-dir cannot be used with --portals; set output_dir per portal")
+        if args.metrics_textfile:
+            parser.error("--metrics-textfile cannot be used with --portals")
+        if args.processes is not None and args.processes < 1:
+            parser.error("--processes must be at least 1")
+        _backup_portals_cli(args, parser)
+        return
+    if args.processes is not None or args.summary:
+        parser.error("--processes and --summary require --portals")
+
+    from .client import HubSpotClient
+
+    metrics = Metrics() if args.metrics or args.metrics_textfile else None
     try:
-        client = HubSpotClient()
+        client = HubSpotClient(pool_size=args.workers, metrics=metrics)
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    print("Listing all HubSpot automation flows (v4)...\n")
-    flows = client.list_flows()
-
-    if not flows:
-        print("No flows returned.")
+    if args.watch:
+        _watch_cli(args, client, metrics)
         return
 
-    print(f"Total flows returned: {len(flows)}")
-    for flow in flows:
+    print("Backing up HubSpot automation flows (v4)...\n")
+    listed = []
+
+    def on_flow(flow: dict) -> None:
+        listed.append(flow.get("id"))
         print(f"{flow.get('id')}: {flow.get('name')}")
 
-    print("\nBacking up flows...")
     run_dir = backup_all_flows(
         client=client,
         output_dir=args.output_dir,
         use_date_dir=args.use_date_dir,
         use_date_prefix=args.use_date_prefix,
+        max_workers=args.workers,
+        incremental=args.incremental,
+        output_format=args.output_format,
+        fsync=args.fsync,
+        on_flow=on_flow,
+        resume=args.resume,
+        json_style=args.json_style,
+        layout=args.layout,
+        catalog=catalog_path(_resolve_output_dir(args.output_dir)) if args.catalog else None,
     )
 
-    print(f"\nBackup complete.")
+    if not listed:
+        print("No flows returned.")
+        return
+
+    print(f"\nTotal flows returned: {len(listed)}")
+    print(f"Backup complete.")
     print(f"Files saved to: {run_dir}")
+    if metrics is not None:
+        print(f"Metrics report: {report_path(run_dir)}")
+        if args.metrics_textfile:
+            metrics.write_prometheus(args.metrics_textfile)
 
     if args.verify:
         print("\nVerifying backup integrity...")
-        results = verify_backups(run_dir)
+        results = verify_backups(run_dir, max_workers=args.workers)
         print(f"  Verified: {len(results['verified'])}")
         if results["failed"]:
             print(f"  Failed: {len(results['failed'])}")
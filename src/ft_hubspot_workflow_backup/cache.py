@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+from .storage import atomic_write
+
+DEFAULT_TTL = 60.0
+
+
+class FlowCache:
+    """
+    Cache of GET /automation/v4/flows/{flowId} responses for HubSpotClient.
+
+    Entries younger than ttl are served without a request. Older entries
+    that came with an ETag are revalidated with If-None-Match, so an
+    unchanged flow costs a 304 instead of its full body. An entry is
+    dropped when the client updates the flow or lists it with a different
+    revisionId. Bodies are kept as the raw response text, so every hit
+    returns a fresh dict callers are free to modify.
+
+    With a path the cache is persisted as JSON between runs, so repeated
+    dry runs reuse the current state; without one it lives for the
+    current process.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = 1024,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            path: JSON file to load from and save to. None keeps it in memory.
+            ttl: Seconds an entry is used without revalidation.
+            max_entries: Entries kept before the least recently used are evicted.
+        """
+        self.path = Path(path) if path is not None else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.is_file():
+            try:
+                with self.path.open("r", encoding="utf-8") as f:
+                    self._entries = OrderedDict(json.load(f).get("entries", {}))
+            except (OSError, ValueError):
+                self._entries = OrderedDict()
+
+    def get(self, flow_id: str) -> Optional[dict]:
+        """
+        Look up a cached flow.
+
+        Args:
+            flow_id: HubSpot flow ID.
+
+        Returns:
+            Entry dict with 'content', 'etag', 'revisionId' and 'stored'
+            (epoch seconds), or None if the flow is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(str(flow_id))
+            if entry is not None:
+                self._entries.move_to_end(str(flow_id))
+            return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        """Check whether an entry can be used without revalidation."""
+        return time.time() - entry["stored"] < self.ttl
+
+    def put(
+        self,
+        flow_id: str,
+        content: str,
+        etag: Optional[str] = None,
+        revision_id: Optional[str] = None,
+    ) -> None:
+        """
+        Store a fetched flow.
+
+        Args:
+            flow_id: HubSpot flow ID.
+            content: Response body text.
+            etag: Response ETag, used to revalidate the entry once stale.
+            revision_id: The flow's revisionId.
+        """
+        entry = {
+            "content": content,
+            "etag": etag,
+            "revisionId": None if revision_id is None else str(revision_id),
+            "stored": time.time(),
+        }
+        with self._lock:
+            self._entries[str(flow_id)] = entry
+            self._entries.move_to_end(str(flow_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, flow_id: str) -> None:
+        """Mark an entry as fresh again, e.g. after a 304 response."""
+        with self._lock:
+            entry = self._entries.get(str(flow_id))
+            if entry is not None:
+                entry["stored"] = time.time()
+
+    def check_revision(self, flow_id: str, revision_id: Optional[str]) -> None:
+        """Drop an entry whose revisionId differs from one seen elsewhere."""
+        if revision_id is None:
+            return
+        with self._lock:
+            entry = self._entries.get(str(flow_id))
+            if entry is not None and entry["revisionId"] != str(revision_id):
+                del self._entries[str(flow_id)]
+
+    def invalidate(self, flow_id: Optional[str] = None) -> None:
+        """Drop one flow, or every flow if flow_id is None."""
+        with self._lock:
+            if flow_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(flow_id), None)
+
+    def save(self) -> None:
+        """Persist the cache, if it has a path."""
+        if self.path is None:
+            return
+        with self._lock:
+            content = json.dumps({"entries": self._entries})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, content.encode("utf-8"))
@@ -0,0 +1,413 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import zipfile
+from pathlib import Path
+from typing import Optional, Union
+
+from .snapshot import load_index, read_entry
+from .verify import find_snapshots
+
+CATALOG_NAME = "_catalog.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    snapshot TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    format TEXT NOT NULL,
+    flow_count INTEGER NOT NULL,
+    UNIQUE (snapshot, timestamp)
+);
+CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp);
+
+CREATE TABLE IF NOT EXISTS entries (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    flow_id TEXT NOT NULL,
+    name TEXT,
+    filename TEXT,
+    hash TEXT,
+    revision_id TEXT,
+    updated_at TEXT,
+    is_enabled INTEGER,
+    PRIMARY KEY (flow_id, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_name ON entries (name);
+CREATE INDEX IF NOT EXISTS entries_hash ON entries (hash);
+CREATE INDEX IF NOT EXISTS entries_run ON entries (run_id);
+"""
+
+_HISTORY_QUERY = """
+SELECT runs.snapshot, runs.timestamp, runs.format, entries.*
+FROM entries JOIN runs ON runs.id = entries.run_id
+WHERE entries.flow_id = ?
+"""
+
+
+def normalize_timestamp(value: str) -> str:
+    """
+    Turn a date or time into the YYYY_MM_DD_HHMMSS run timestamp format.
+
+    Any separators are accepted ("2026-01-20", "2026-01-20T12:30",
+    "2026_01_20_123000"). Missing time parts are filled in as the end of
+    that day, hour or minute, so a date selects every run made on it.
+
+    Args:
+        value: Date or timestamp string.
+
+    Returns:
+        Timestamp string comparable with run timestamps.
+    """
+    digits = re.sub(r"\D", "", value)
+    if len(digits) < 8 or len(digits) > 14:
+        raise ValueError(f"Invalid date or timestamp: {value}")
+    digits += "235959"[len(digits) - 8:]
+    return f"{digits[0:4]}_{digits[4:6]}_{digits[6:8]}_{digits[8:14]}"
+
+
+class Catalog:
+    """
+    SQLite catalog of backup runs and the flows they contain.
+
+    Each run's _index.json is recorded once (runs and entries tables,
+    indexed by flow ID, name and hash), so history and point-in-time
+    lookups are index queries instead of parsing every dated index.
+    Snapshot paths are stored relative to the catalog's directory.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open (or create) a catalog.
+
+        Args:
+            path: SQLite database file, usually <output_dir>/_catalog.sqlite.
+        """
+        self.path = Path(path)
+        self.root = self.path.parent
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _relative(self, snapshot: Union[str, Path]) -> str:
+        return Path(os.path.relpath(Path(snapshot).resolve(), self.root.resolve())).as_posix()
+
+    def _record(self, row: sqlite3.Row) -> dict:
+        """Convert a history row into an index-entry-like dict."""
+        return {
+            "id": row["flow_id"],
+            "name": row["name"],
+            "filename": row["filename"],
+            "hash": row["hash"],
+            "revisionId": row["revision_id"],
+            "updatedAt": row["updated_at"],
+            "isEnabled": None if row["is_enabled"] is None else bool(row["is_enabled"]),
+            "timestamp": row["timestamp"],
+            "format": row["format"],
+            "snapshot": str(self.root / row["snapshot"]),
+        }
+
+    def add_run(self, snapshot: Union[str, Path], index: Optional[dict] = None) -> None:
+        """
+        Record a run, replacing any earlier record of the same run.
+
+        Args:
+            snapshot: Snapshot directory or archive.
+            index: The run's parsed _index.json. Loaded from snapshot if omitted.
+        """
+        if index is None:
+            index = load_index(snapshot)
+        flows = index.get("flows", [])
+        with self._db:
+            self._db.execute(
+                "DELETE FROM runs WHERE snapshot = ? AND timestamp = ?",
+                (self._relative(snapshot), index.get("timestamp", "")),
+            )
+            run_id = self._db.execute(
+                "INSERT INTO runs (snapshot, timestamp, format, flow_count) VALUES (?, ?, ?, ?)",
+                (
+                    self._relative(snapshot),
+                    index.get("timestamp", ""),
+                    index.get("format", "files"),
+                    len(flows),
+                ),
+            ).lastrowid
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        str(entry["id"]),
+                        entry.get("name"),
+                        entry.get("filename"),
+                        entry.get("hash"),
+                        None if entry.get("revisionId") is None else str(entry["revisionId"]),
+                        entry.get("updatedAt"),
+                        None if entry.get("isEnabled") is None else int(bool(entry["isEnabled"])),
+                    )
+                    for entry in flows
+                    if entry.get("id")
+                ],
+            )
+
+    def remove_run(self, snapshot: Union[str, Path]) -> None:
+        """Forget every run recorded for a snapshot path, e.g. after pruning it."""
+        with self._db:
+            self._db.execute("DELETE FROM runs WHERE snapshot = ?", (self._relative(snapshot),))
+
+    def rebuild(self, output_dir: Optional[Union[str, Path]] = None) -> int:
+        """
+        Re-create the catalog from the snapshots currently on disk.
+
+        Args:
+            output_dir: Snapshot output root. Defaults to the catalog's directory.
+
+        Returns:
+            Number of runs recorded.
+        """
+        snapshots = find_snapshots(self.root if output_dir is None else output_dir)
+        with self._db:
+            self._db.execute("DELETE FROM runs")
+        count = 0
+        for snapshot in snapshots:
+            try:
+                self.add_run(snapshot)
+            except (OSError, ValueError, zipfile.BadZipFile):
+                continue
+            count += 1
+        return count
+
+    def runs(self) -> list:
+        """
+        List recorded runs, oldest first.
+
+        Returns:
+            List of dicts with snapshot, timestamp, format and flow_count.
+        """
+        rows = self._db.execute(
+            "SELECT snapshot, timestamp, format, flow_count FROM runs ORDER BY timestamp, snapshot"
+        )
+        return [
+            dict(row, snapshot=str(self.root / row["snapshot"]))
+            for row in rows
+        ]
+
+    def history(self, flow_id: Union[str, int], changes_only: bool = False) -> list:
+        """
+        List every recorded version of a flow, oldest first.
+
+        Args:
+            flow_id: HubSpot flow ID.
+            changes_only: If True, only keep runs where the flow's hash
+                differs from the previous run (i.e. its content changed).
+
+        Returns:
+            List of entry dicts with the run's timestamp, format and
+            snapshot path, plus a 'changed' flag.
+        """
+        rows = self._db.execute(
+            _HISTORY_QUERY + " ORDER BY runs.timestamp, runs.snapshot", (str(flow_id),)
+        )
+        history = []
+        last_hash = None
+        for row in rows:
+            record = self._record(row)
+            record["changed"] = record["hash"] != last_hash
+            last_hash = record["hash"]
+            if record["changed"] or not changes_only:
+                history.append(record)
+        return history
+
+    def at(self, flow_id: Union[str, int], when: str) -> Optional[dict]:
+        """
+        Find the version of a flow that was current at a point in time.
+
+        Args:
+            flow_id: HubSpot flow ID.
+            when: Date or timestamp, see normalize_timestamp.
+
+        Returns:
+            Entry dict from the last run at or before when, or None.
+        """
+        row = self._db.execute(
+            _HISTORY_QUERY + " AND runs.timestamp <= ? ORDER BY runs.timestamp DESC LIMIT 1",
+            (str(flow_id), normalize_timestamp(when)),
+        ).fetchone()
+        return None if row is None else self._record(row)
+
+    def latest_good(self, flow_id: Union[str, int]) -> Optional[dict]:
+        """
+        Find the most recent version of a flow whose stored bytes verify.
+
+        Runs are checked newest first; a version is good if its file (or
+        archive member) still exists and matches the recorded SHA-256.
+
+        Args:
+            flow_id: HubSpot flow ID.
+
+        Returns:
+            Entry dict, or None if no recorded version verifies.
+        """
+        rows = self._db.execute(
+            _HISTORY_QUERY + " AND entries.hash IS NOT NULL ORDER BY runs.timestamp DESC",
+            (str(flow_id),),
+        )
+        for row in rows:
+            record = self._record(row)
+            snapshot = Path(record["snapshot"])
+            if not snapshot.exists():
+                continue
+            try:
+                content = read_entry(snapshot, record)
+            except (OSError, zipfile.BadZipFile):
+                continue
+            if content is not None and hashlib.sha256(content).hexdigest() == record["hash"]:
+                return record
+        return None
+
+    def find(self, pattern: str) -> list:
+        """
+        Find flows by name, using each flow's most recently recorded name.
+
+        Args:
+            pattern: Glob pattern, case-insensitive (e.g. "lead*").
+
+        Returns:
+            List of dicts with id, name and the timestamp of the last run
+            containing the flow.
+        """
+        rows = self._db.execute(
+            """
+            SELECT flow_id, name, MAX(runs.timestamp) AS timestamp
+            FROM entries JOIN runs ON runs.id = entries.run_id
+            GROUP BY flow_id
+            HAVING lower(name) GLOB lower(?)
+            ORDER BY name
+            """,
+            (pattern,),
+        )
+        return [
+            {"id": row["flow_id"], "name": row["name"], "timestamp": row["timestamp"]}
+            for row in rows
+        ]
+
+
+def catalog_path(output_dir: Union[str, Path]) -> Path:
+    """Return the default catalog location for a snapshot output root."""
+    return Path(output_dir) / CATALOG_NAME
+
+
+def _print_entry(entry: dict) -> None:
+    marker = "*" if entry.get("changed") else " "
+    print(
+        f"{marker} {entry['timestamp']}  {entry['name']}  "
+        f"revision {entry['revisionId']}  {(entry['hash'] or '')[:12]}  {entry['snapshot']}"
+    )
+
+
+def main() -> None:
+    """CLI entry point for workflows-catalog command."""
+    parser = argparse.ArgumentParser(
+        description="Query the snapshot catalog for workflow history."
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        default=None,
+        help="Snapshot output directory holding the catalog (default: ./snapshots/)",
+    )
+    parser.add_argument(
+        "--catalog",
+        default=None,
+        help=f"Catalog file (default: <output-dir>/{CATALOG_NAME})",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("rebuild", help="Re-create the catalog from the snapshots on disk")
+    commands.add_parser("runs", help="List recorded backup runs")
+
+    history = commands.add_parser("history", help="Show every recorded version of a flow")
+    history.add_argument("flow_id", help="HubSpot flow ID")
+    history.add_argument(
+        "--changes", action="store_true", help="Only show runs where the flow's content changed"
+    )
+
+    latest = commands.add_parser("latest", help="Show the most recent version that verifies")
+    latest.add_argument("flow_id", help="HubSpot flow ID")
+
+    at = commands.add_parser("at", help="Show the version current at a date or time")
+    at.add_argument("flow_id", help="HubSpot flow ID")
+    at.add_argument("when", help="Date or timestamp, e.g. 2026-01-20 or 2026-01-20T12:30")
+
+    find = commands.add_parser("find", help="Find flows by name")
+    find.add_argument("pattern", help='Case-insensitive glob pattern, e.g. "lead*"')
+
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir) if args.output_dir else Path.cwd() / "snapshots"
+    path = Path(args.catalog) if args.catalog else catalog_path(output_dir)
+    if args.command != "rebuild" and not path.is_file():
+        print(f"Catalog not found: {path} (run 'workflows-catalog rebuild' first)", file=sys.stderr)
+        sys.exit(1)
+
+    with Catalog(path) as catalog:
+        try:
+            if args.command == "rebuild":
+                result = {"runs": catalog.rebuild(output_dir)}
+            elif args.command == "runs":
+                result = catalog.runs()
+            elif args.command == "history":
+                result = catalog.history(args.flow_id, changes_only=args.changes)
+            elif args.command == "latest":
+                result = catalog.latest_good(args.flow_id)
+            elif args.command == "at":
+                result = catalog.at(args.flow_id, args.when)
+            else:
+                result = catalog.find(args.pattern)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    if args.command == "rebuild":
+        print(f"Recorded {result['runs']} runs in {path}")
+    elif args.command == "runs":
+        for run in result:
+            print(f"{run['timestamp']}  {run['format']:<8} {run['flow_count']:>6} flows  {run['snapshot']}")
+    elif args.command == "history":
+        if not result:
+            print(f"Flow {args.flow_id} not found in catalog.")
+        for entry in result:
+            _print_entry(entry)
+    elif args.command == "find":
+        for flow in result:
+            print(f"{flow['id']}  {flow['name']}  (last seen {flow['timestamp']})")
+    elif result is None:
+        print(f"No matching version of flow {args.flow_id} found.", file=sys.stderr)
+        sys.exit(1)
+    else:
+        _print_entry(result)
+        print(f"\nRestore with: workflows-restore {result['snapshot']} --flow-id {result['id']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,55 @@
+import json
 import os
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Iterator, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .ratelimit import RateLimiter, parse_retry_after
+
+if TYPE_CHECKING:
+    from .cache import FlowCache
+    from .metrics import Metrics
 
 
 class HubSpotClient:
     """Client for HubSpot Automation v4 API."""
 
     BASE_URL = "https://api.hubapi.com"
-
-    def __init__(self, token: Optional[str] = None):
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_rate_limit_retries: int = 8,
+        base_url: Optional[str] = None,
+        metrics: Optional["Metrics"] = None,
+        cache: Optional["FlowCache"] = None,
+    ):
         """
         Initialize client.
 
         Args:
             token: HubSpot private app token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
+            pool_size: Maximum number of pooled keep-alive connections. Match
+                this to the number of worker threads sharing the client.
+            max_retries: Retries for connection errors and 5xx responses. PUTs
+                are only retried when the connection could not be established.
+            backoff_factor: Exponential backoff factor between retries, in seconds.
+            rate_limiter: RateLimiter pacing requests. Share one instance between
+                clients that use the same private app quota.
+            max_rate_limit_retries: Retries for 429 responses before giving up.
+            base_url: API root. Defaults to BASE_URL; override for proxies or
+                a local mock server.
+            metrics: Metrics collector recording request latency, bytes,
+                status codes and retries.
+            cache: FlowCache reused by get_flow for recently fetched flows.
         """
         self.token = token or os.getenv("HUBSPOT_AUTOMATION_TOKEN")
         if not self.token:
@@ -26,24 +61,122 @@ class HubSpotClient:
             "Content-Type": "application/json",
         }
 
-    def list_flows(self) -> list:
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.base_url = (base_url or self.BASE_URL).rstrip("/")
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.metrics = metrics
+        self.cache = cache
+
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "HubSpotClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
         """
-        List all automation flows with pagination.
+        Send a request paced by the rate limiter, retrying 429 responses.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Passed through to requests.Session.request.
 
         Returns:
-            List of flow summary dicts.
+            Successful response.
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            resp = self._send(method, url, **kwargs)
+            self.rate_limiter.update(resp.headers)
+            if resp.status_code != 429 or attempt >= self.max_rate_limit_retries:
+                break
+            delay = parse_retry_after(resp.headers.get("Retry-After"))
+            if delay is None:
+                delay = self.backoff_factor * (2 ** attempt)
+            if self.metrics is not None:
+                self.metrics.observe_retry("rate_limit")
+            self.rate_limiter.pause(delay)
+            attempt += 1
+        resp.raise_for_status()
+        return resp
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send one request through the session, recording it in metrics."""
+        if self.metrics is None:
+            return self._session.request(method, url, timeout=30, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            resp = self._session.request(method, url, timeout=30, **kwargs)
+        except requests.RequestException:
+            self.metrics.observe_request(method, None, time.perf_counter() - start)
+            raise
+        elapsed = time.perf_counter() - start
+
+        body = resp.request.body or b""
+        self.metrics.observe_request(
+            method,
+            resp.status_code,
+            elapsed,
+            bytes_sent=len(body),
+            bytes_received=len(resp.content),
+        )
+        retries = getattr(resp.raw, "retries", None)
+        if retries is not None:
+            self.metrics.observe_retry("server_error", len(retries.history))
+        return resp
+
+    def iter_flows(self) -> Iterator[dict]:
+        """
+        Iterate over all automation flows, fetching pages lazily.
+
+        Each page is requested only when the previous one has been consumed,
+        so callers can start working on the first flows while later pages
+        are still to come.
+
+        Yields:
+            Flow summary dicts.
         """
-        url = f"{self.BASE_URL}/automation/v4/flows"
+        url = f"{self.base_url}/automation/v4/flows"
         params = {"limit": 100}
-        flows: list = []
 
         while True:
-            resp = requests.get(url, headers=self._headers, params=params, timeout=30)
-            resp.raise_for_status()
+            resp = self._request("GET", url, params=params)
 
             data = resp.json()
-            batch = data.get("results", [])
-            flows.extend(batch)
+            results = data.get("results", [])
+            if self.cache is not None:
+                for flow in results:
+                    self.cache.check_revision(flow.get("id"), flow.get("revisionId"))
+            yield from results
 
             paging = data.get("paging") or {}
             next_page = paging.get("next") if isinstance(paging, dict) else None
@@ -52,22 +185,46 @@ class HubSpotClient:
                 break
             params["after"] = after
 
-        return flows
+    def list_flows(self) -> list:
+        """
+        List all automation flows with pagination.
+
+        Returns:
+            List of flow summary dicts.
+        """
+        return list(self.iter_flows())
 
     def get_flow(self, flow_id: str) -> dict:
         """
         Get full details of a flow.
 
+        With a cache, a recently fetched flow is returned without a
+        request, and an older one is revalidated with If-None-Match when
+        the API sent an ETag for it.
+
         Args:
             flow_id: HubSpot flow ID.
 
         Returns:
             Flow details dict.
         """
-        url = f"{self.BASE_URL}/automation/v4/flows/{flow_id}"
-        resp = requests.get(url, headers=self._headers, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
+        url = f"{self.base_url}/automation/v4/flows/{flow_id}"
+        if self.cache is None:
+            return self._request("GET", url).json()
+
+        cached = self.cache.get(flow_id)
+        if cached is not None and self.cache.is_fresh(cached):
+            return json.loads(cached["content"])
+
+        headers = {"If-None-Match": cached["etag"]} if cached and cached["etag"] else None
+        resp = self._request("GET", url, headers=headers)
+        if resp.status_code == 304 and cached is not None:
+            self.cache.touch(flow_id)
+            return json.loads(cached["content"])
+
+        flow = resp.json()
+        self.cache.put(flow_id, resp.text, resp.headers.get("ETag"), flow.get("revisionId"))
+        return flow
 
     def update_flow(self, flow_id: str, body: dict) -> dict:
         """
@@ -80,7 +237,10 @@ class HubSpotClient:
         Returns:
             Updated flow dict.
         """
-        url = f"{self.BASE_URL}/automation/v4/flows/{flow_id}"
-        resp = requests.put(url, headers=self._headers, json=body, timeout=30)
-        resp.raise_for_status()
+        url = f"{self.base_url}/automation/v4/flows/{flow_id}"
+        try:
+            resp = self._request("PUT", url, json=body)
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate(flow_id)
         return resp.json()
@@ -0,0 +1,314 @@
+import argparse
+import hashlib
+import json
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+from .backup import normalize_flow
+from .serialize import serialize_flow
+from .snapshot import is_archive, load_index, read_entry
+
+if TYPE_CHECKING:
+    from .client import HubSpotClient
+
+# Fields that change on every edit and say nothing about what was edited.
+VOLATILE_FIELDS = ("revisionId", "updatedAt")
+
+
+def _entries_by_id(index: dict) -> dict:
+    """Map flow ID strings to index entries."""
+    return {str(entry["id"]): entry for entry in index.get("flows", []) if entry.get("id")}
+
+
+def _summary(flow_id: str, entry: dict) -> dict:
+    return {"id": flow_id, "name": entry.get("name")}
+
+
+def _diff_paths(old, new, prefix: str = "") -> list:
+    """
+    List the paths at which two JSON values differ.
+
+    Dicts are compared key by key and equal-length lists item by item, so a
+    change deep inside an action is reported as e.g. 'fields.value.staticValue'.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        paths = []
+        for key in sorted(set(old) | set(new), key=str):
+            path = f"{prefix}.{key}" if prefix else str(key)
+            if key not in old or key not in new:
+                paths.append(path)
+            else:
+                paths.extend(_diff_paths(old[key], new[key], path))
+        return paths
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        paths = []
+        for i, (old_item, new_item) in enumerate(zip(old, new)):
+            paths.extend(_diff_paths(old_item, new_item, f"{prefix}[{i}]"))
+        return paths
+    return [prefix or "."]
+
+
+def diff_flows(old: dict, new: dict) -> dict:
+    """
+    Structurally diff two versions of a flow.
+
+    Actions are matched by actionId; other top-level fields are compared
+    as a whole, ignoring revisionId and updatedAt.
+
+    Args:
+        old: Old flow dict.
+        new: New flow dict.
+
+    Returns:
+        Dict with 'fields' (changed top-level keys) and 'actions' holding
+        'added' and 'removed' action IDs and 'changed' records of actionId
+        and the changed paths inside the action.
+    """
+    fields = [
+        key for key in sorted(set(old) | set(new))
+        if key != "actions" and key not in VOLATILE_FIELDS and old.get(key) != new.get(key)
+    ]
+
+    old_actions = {str(a.get("actionId")): a for a in old.get("actions") or []}
+    new_actions = {str(a.get("actionId")): a for a in new.get("actions") or []}
+
+    changed = []
+    for action_id, action in old_actions.items():
+        other = new_actions.get(action_id)
+        if other is not None and other != action:
+            changed.append({"actionId": action_id, "paths": _diff_paths(action, other)})
+
+    return {
+        "fields": fields,
+        "actions": {
+            "added": [a for a in new_actions if a not in old_actions],
+            "removed": [a for a in old_actions if a not in new_actions],
+            "changed": changed,
+        },
+    }
+
+
+class _SnapshotReader:
+    """Read flows from a snapshot, keeping an archive open between reads."""
+
+    def __init__(self, snapshot: Path):
+        self.snapshot = snapshot
+        self._archive = zipfile.ZipFile(snapshot) if is_archive(snapshot) else None
+
+    def read(self, entry: dict) -> Optional[dict]:
+        content = read_entry(self.snapshot, entry, self._archive)
+        return None if content is None else json.loads(content)
+
+    def close(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+
+
+def _live_flow(client: "HubSpotClient", flow_id: str) -> Optional[dict]:
+    """Fetch and normalize a live flow, or return None if it was deleted."""
+    import requests
+
+    try:
+        return normalize_flow(client.get_flow(flow_id))
+    except requests.HTTPError as e:
+        response = getattr(e, "response", None)
+        if response is not None and response.status_code == 404:
+            return None
+        raise
+
+
+def diff_snapshots(
+    old: Union[str, Path],
+    new: Optional[Union[str, Path]] = None,
+    client: Optional["HubSpotClient"] = None,
+    token: Optional[str] = None,
+    max_workers: int = 1,
+) -> dict:
+    """
+    Compare two snapshots, or a snapshot against the live portal.
+
+    Flows whose index hashes match are skipped without being read, so the
+    cost is one index read per side plus the changed flows. Against the
+    live portal, flows whose revisionId is unchanged are skipped without a
+    GET; the others are fetched, normalized and hashed like a backup.
+
+    Args:
+        old: Old snapshot directory or archive.
+        new: New snapshot directory or archive. None compares with live.
+        client: Pre-configured HubSpotClient for live comparisons.
+        token: HubSpot token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
+        max_workers: Number of live flows fetched concurrently.
+
+    Returns:
+        Dict with 'old', 'new', 'added' and 'removed' lists of {id, name},
+        'changed' list of {id, name} records extended with diff_flows
+        output, and the 'unchanged' flow count.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+
+    old_path = Path(old)
+    old_index = load_index(old_path)
+    old_entries = _entries_by_id(old_index)
+    old_style = old_index.get("style", "indent")
+    old_reader = _SnapshotReader(old_path)
+
+    owns_client = False
+    new_reader = None
+    try:
+        if new is not None:
+            new_path = Path(new)
+            new_entries = _entries_by_id(load_index(new_path))
+            new_reader = _SnapshotReader(new_path)
+            new_label = str(new_path)
+        else:
+            if client is None:
+                from .client import HubSpotClient
+
+                client = HubSpotClient(token=token, pool_size=max_workers)
+                owns_client = True
+            new_entries = {str(flow["id"]): flow for flow in client.list_flows() if flow.get("id")}
+            new_label = "live"
+
+        added = [_summary(i, e) for i, e in new_entries.items() if i not in old_entries]
+        removed = [_summary(i, e) for i, e in old_entries.items() if i not in new_entries]
+
+        candidates = []
+        unchanged = 0
+        for flow_id, old_entry in old_entries.items():
+            new_entry = new_entries.get(flow_id)
+            if new_entry is None:
+                continue
+            if new_reader is not None:
+                same = old_entry.get("hash") and old_entry.get("hash") == new_entry.get("hash")
+            else:
+                same = (
+                    old_entry.get("revisionId") is not None
+                    and str(old_entry.get("revisionId")) == str(new_entry.get("revisionId"))
+                )
+            if same:
+                unchanged += 1
+            else:
+                candidates.append((flow_id, old_entry, new_entry))
+
+        def load_pair(candidate: tuple) -> tuple:
+            flow_id, old_entry, new_entry = candidate
+            if new_reader is not None:
+                return old_reader.read(old_entry), new_reader.read(new_entry)
+            new_flow = _live_flow(client, flow_id)
+            if new_flow is not None and old_entry.get("hash"):
+                digest = hashlib.sha256(serialize_flow(new_flow, old_style)).hexdigest()
+                if digest == old_entry["hash"]:
+                    return None, None
+            return old_reader.read(old_entry), new_flow
+
+        if new_reader is None and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pairs = list(executor.map(load_pair, candidates))
+        else:
+            pairs = [load_pair(candidate) for candidate in candidates]
+    finally:
+        old_reader.close()
+        if new_reader is not None:
+            new_reader.close()
+        if owns_client:
+            client.close()
+
+    changed = []
+    for (flow_id, old_entry, new_entry), (old_flow, new_flow) in zip(candidates, pairs):
+        if old_flow is None and new_flow is None:
+            unchanged += 1
+            continue
+        if new_flow is None:
+            removed.append(_summary(flow_id, old_entry))
+            continue
+        if old_flow is None:
+            raise FileNotFoundError(f"Backup file not found: {old_entry.get('filename')}")
+        flow_diff = diff_flows(old_flow, new_flow)
+        if not flow_diff["fields"] and not any(flow_diff["actions"].values()):
+            unchanged += 1
+            continue
+        record = _summary(flow_id, new_entry)
+        record.update(flow_diff)
+        changed.append(record)
+
+    return {
+        "old": str(old_path),
+        "new": new_label,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "unchanged": unchanged,
+    }
+
+
+def _print_diff(result: dict) -> None:
+    """Print a diff_snapshots result as a readable summary."""
+    print(f"Comparing {result['old']} -> {result['new']}\n")
+
+    print(f"Added ({len(result['added'])}):")
+    for flow in result["added"]:
+        print(f"  + {flow['id']}: {flow['name']}")
+
+    print(f"Removed ({len(result['removed'])}):")
+    for flow in result["removed"]:
+        print(f"  - {flow['id']}: {flow['name']}")
+
+    print(f"Changed ({len(result['changed'])}):")
+    for flow in result["changed"]:
+        print(f"  ~ {flow['id']}: {flow['name']}")
+        if flow["fields"]:
+            print(f"      fields: {', '.join(flow['fields'])}")
+        actions = flow["actions"]
+        if actions["added"]:
+            print(f"      actions added: {', '.join(actions['added'])}")
+        if actions["removed"]:
+            print(f"      actions removed: {', '.join(actions['removed'])}")
+        for action in actions["changed"]:
+            print(f"      action {action['actionId']}: {', '.join(action['paths'])}")
+
+    print(f"\nUnchanged: {result['unchanged']}")
+
+
+def main() -> None:
+    """CLI entry point for workflows-diff command."""
+    parser = argparse.ArgumentParser(
+        description="Compare two workflow snapshots, or a snapshot against the live portal."
+    )
+    parser.add_argument("old", help="Old snapshot directory or archive")
+    parser.add_argument(
+        "new",
+        nargs="?",
+        help="New snapshot directory or archive (default: compare against live flows)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of live flows to fetch concurrently (default: 1)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the diff as JSON")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    try:
+        result = diff_snapshots(args.old, args.new, max_workers=args.workers)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_diff(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import json
+import sys
+import zipfile
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from .metrics import is_report
+from .snapshot import entry_path, is_archive, load_index, select_entries
+
+
+def inspect_snapshot(
+    snapshot: Union[str, Path],
+    flow_ids: Optional[Iterable[Union[str, int]]] = None,
+    name_pattern: Optional[str] = None,
+) -> dict:
+    """
+    Describe a snapshot and the flows a restore from it would touch.
+
+    Only _index.json is read and the flow files are checked for existence,
+    so this works offline and without a token; the run's metrics report is
+    never taken for a flow file. The selection matches restore_snapshot's,
+    which makes it a plan for the same --only/--match restore.
+
+    Args:
+        snapshot: Snapshot directory or archive.
+        flow_ids: Only these flow IDs.
+        name_pattern: Only flows whose name matches this glob pattern.
+
+    Returns:
+        Dict with snapshot, timestamp, format, style, total (flows in the
+        snapshot), flows (selected entries with id, name, revisionId,
+        updatedAt, filename, hash and present) and missing (requested IDs
+        not in the snapshot).
+    """
+    path = Path(snapshot)
+    index = load_index(path)
+    selected, missing = select_entries(index, flow_ids, name_pattern)
+
+    if is_archive(path):
+        with zipfile.ZipFile(path) as archive:
+            members = set(archive.namelist())
+
+        def exists(entry: dict) -> bool:
+            return entry["filename"] in members
+    else:
+        def exists(entry: dict) -> bool:
+            return entry_path(path, entry).is_file()
+
+    def present(entry: dict) -> bool:
+        filename = entry.get("filename")
+        return bool(filename) and not is_report(filename) and exists(entry)
+
+    flows = [
+        {
+            "id": str(entry["id"]),
+            "name": entry.get("name"),
+            "revisionId": entry.get("revisionId"),
+            "updatedAt": entry.get("updatedAt"),
+            "filename": entry.get("filename"),
+            "hash": entry.get("hash"),
+            "present": present(entry),
+        }
+        for entry in selected
+    ]
+    return {
+        "snapshot": str(path),
+        "timestamp": index.get("timestamp"),
+        "format": index.get("format", "files"),
+        "style": index.get("style", "indent"),
+        "total": sum(1 for entry in index.get("flows", []) if entry.get("id")),
+        "flows": flows,
+        "missing": missing,
+    }
+
+
+def main() -> None:
+    """CLI entry point for workflows-inspect command."""
+    parser = argparse.ArgumentParser(
+        description="Show a snapshot's flows and plan a restore from it, offline "
+                    "(no HubSpot token needed)."
+    )
+    parser.add_argument("snapshot", help="Snapshot directory or archive")
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        metavar="IDS",
+        help="Only these comma-separated flow IDs (repeatable)",
+    )
+    parser.add_argument(
+        "--match",
+        metavar="GLOB",
+        help="Only flows whose name matches this glob pattern",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    flow_ids = [flow_id.strip() for value in args.only for flow_id in value.split(",") if flow_id.strip()]
+    try:
+        result = inspect_snapshot(args.snapshot, flow_ids=flow_ids, name_pattern=args.match)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    absent = [flow for flow in result["flows"] if not flow["present"]]
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"Snapshot: {result['snapshot']}")
+        print(f"  timestamp: {result['timestamp']}")
+        print(f"  format: {result['format']} ({result['style']} JSON)")
+        print(f"  flows: {result['total']}")
+        print()
+        for flow in result["flows"]:
+            status = "" if flow["present"] else "  [file missing]"
+            print(f"  {flow['id']:<12} revisionId {str(flow['revisionId']):<8} {flow['name']}{status}")
+        print(f"\nSelected for restore: {len(result['flows'])}")
+        if absent:
+            print(f"Backup files missing: {len(absent)}")
+        if result["missing"]:
+            print(f"Not in snapshot: {', '.join(result['missing'])}")
+
+    if absent or result["missing"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
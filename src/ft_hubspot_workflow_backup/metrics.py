@@ -0,0 +1,237 @@
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from .snapshot import is_archive
+from .storage import atomic_write
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# The dot in the stem keeps the report name out of slugify's range, so no
+# flow file can take it.
+METRICS_NAME = "_run.metrics.json"
+METRICS_SUFFIX = ".metrics.json"
+PROMETHEUS_PREFIX = "hubspot_workflows"
+
+
+class Metrics:
+    """
+    Thread-safe collector for request and stage timings.
+
+    Pass one instance to HubSpotClient (metrics=) to record per-request
+    latency histograms, bytes transferred, status codes and retries;
+    backup_all_flows and restore_flow then also record the wall time of
+    their stages (list, fetch, normalize, serialize, hash, write, put...).
+    Stage times are summed over worker threads, so with several workers a
+    stage can add up to more than the run's wall time.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        """
+        Initialize collector.
+
+        Args:
+            buckets: Upper bounds of the latency histogram buckets, in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._requests: dict = {}
+        self._retries: dict = {}
+        self._stages: dict = {}
+        self._lock = threading.Lock()
+
+    def observe_request(
+        self,
+        method: str,
+        status: Optional[int],
+        seconds: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """
+        Record one HTTP request.
+
+        Args:
+            method: HTTP method.
+            status: Response status code, or None if no response was received.
+            seconds: Request latency.
+            bytes_sent: Request body size.
+            bytes_received: Response body size.
+        """
+        status_key = str(status) if status is not None else "error"
+        with self._lock:
+            stats = self._requests.get(method)
+            if stats is None:
+                stats = self._requests[method] = {
+                    "count": 0,
+                    "seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "buckets": [0] * len(self.buckets),
+                    "statuses": {},
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                }
+            stats["count"] += 1
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats["buckets"][i] += 1
+            stats["statuses"][status_key] = stats["statuses"].get(status_key, 0) + 1
+            stats["bytes_sent"] += bytes_sent
+            stats["bytes_received"] += bytes_received
+
+    def observe_retry(self, reason: str, count: int = 1) -> None:
+        """
+        Record retried requests.
+
+        Args:
+            reason: Why the request was retried, e.g. 'rate_limit', 'server_error'
+                or 'conflict'.
+            count: Number of retries.
+        """
+        if count <= 0:
+            return
+        with self._lock:
+            self._retries[reason] = self._retries.get(reason, 0) + count
+
+    def observe_stage(self, name: str, seconds: float) -> None:
+        """Add one timed run of a stage."""
+        with self._lock:
+            stats = self._stages.setdefault(name, {"count": 0, "seconds": 0.0})
+            stats["count"] += 1
+            stats["seconds"] += seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one run of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(name, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """
+        Return the collected metrics.
+
+        Returns:
+            Dict with 'requests' (per method: count, seconds, max_seconds,
+            cumulative 'buckets' keyed by upper bound, 'statuses', bytes_sent,
+            bytes_received), 'retries' by reason and 'stages' (count, seconds).
+        """
+        with self._lock:
+            requests = {}
+            for method, stats in self._requests.items():
+                requests[method] = dict(
+                    stats,
+                    buckets={str(b): n for b, n in zip(self.buckets, stats["buckets"])},
+                    statuses=dict(stats["statuses"]),
+                )
+                requests[method]["buckets"]["+Inf"] = stats["count"]
+            return {
+                "requests": requests,
+                "retries": dict(self._retries),
+                "stages": {name: dict(stats) for name, stats in self._stages.items()},
+            }
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix.
+
+        Returns:
+            Text suitable for the node_exporter textfile collector.
+        """
+        data = self.snapshot()
+        lines = []
+
+        def header(name: str, kind: str, help_text: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            return f"{prefix}_{name}"
+
+        name = header("request_duration_seconds", "histogram", "HubSpot API request latency.")
+        for method, stats in sorted(data["requests"].items()):
+            for bound, count in stats["buckets"].items():
+                lines.append(f'{name}_bucket{{method="{method}",le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{method="{method}"}} {stats["seconds"]:.6f}')
+            lines.append(f'{name}_count{{method="{method}"}} {stats["count"]}')
+
+        name = header("responses_total", "counter", "HubSpot API responses by status code.")
+        for method, stats in sorted(data["requests"].items()):
+            for status, count in sorted(stats["statuses"].items()):
+                lines.append(f'{name}{{method="{method}",status="{status}"}} {count}')
+
+        name = header("transferred_bytes_total", "counter", "HubSpot API body bytes transferred.")
+        for method, stats in sorted(data["requests"].items()):
+            lines.append(f'{name}{{method="{method}",direction="sent"}} {stats["bytes_sent"]}')
+            lines.append(f'{name}{{method="{method}",direction="received"}} {stats["bytes_received"]}')
+
+        name = header("retries_total", "counter", "Retried HubSpot API requests by reason.")
+        for reason, count in sorted(data["retries"].items()):
+            lines.append(f'{name}{{reason="{reason}"}} {count}')
+
+        name = header("stage_seconds_total", "counter", "Time spent per backup/restore stage.")
+        for stage, stats in sorted(data["stages"].items()):
+            lines.append(f'{name}{{stage="{stage}"}} {stats["seconds"]:.6f}')
+        name = header("stage_runs_total", "counter", "Runs per backup/restore stage.")
+        for stage, stats in sorted(data["stages"].items()):
+            lines.append(f'{name}{{stage="{stage}"}} {stats["count"]}')
+
+        name = header("report_timestamp_seconds", "gauge", "When this report was written.")
+        lines.append(f"{name} {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: Union[str, Path]) -> Path:
+        """Atomically write snapshot() as JSON to path."""
+        path = Path(path)
+        atomic_write(path, json.dumps(self.snapshot(), indent=2).encode("utf-8"))
+        return path
+
+    def write_prometheus(self, path: Union[str, Path], prefix: str = PROMETHEUS_PREFIX) -> Path:
+        """Atomically write the Prometheus textfile to path."""
+        path = Path(path)
+        atomic_write(path, self.to_prometheus(prefix).encode("utf-8"))
+        return path
+
+
+def track_stage(metrics: Optional[Metrics], name: str):
+    """Return a context manager timing a stage, or a no-op without metrics."""
+    if metrics is None:
+        return nullcontext()
+    return metrics.stage(name)
+
+
+def report_path(snapshot: Union[str, Path]) -> Path:
+    """
+    Return where a run's metrics report lives: _run.metrics.json next to
+    _index.json, or <archive>.metrics.json beside an archive.
+
+    Args:
+        snapshot: Snapshot directory or archive path.
+
+    Returns:
+        Metrics report path.
+    """
+    path = Path(snapshot)
+    if is_archive(path):
+        return path.with_name(f"{path.stem}{METRICS_SUFFIX}")
+    return path / METRICS_NAME
+
+
+def is_report(path: Union[str, Path]) -> bool:
+    """
+    Check whether a file name is a metrics report rather than a backup.
+
+    Args:
+        path: File path, or a filename from an index entry.
+
+    Returns:
+        True for _run.metrics.json and <archive>.metrics.json.
+    """
+    return Path(path).name.endswith(METRICS_SUFFIX)
@@ -0,0 +1,210 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+from .backup import backup_all_flows
+from .catalog import catalog_path
+from .client import HubSpotClient
+from .metrics import Metrics
+from .verify import verify_backups
+
+# Per-portal settings passed straight to backup_all_flows.
+BACKUP_OPTIONS = (
+    "use_date_dir",
+    "use_date_prefix",
+    "max_workers",
+    "incremental",
+    "output_format",
+    "fsync",
+    "resume",
+    "json_style",
+    "layout",
+)
+# Per-portal switches handled around the backup itself.
+EXTRA_OPTIONS = ("catalog", "metrics", "verify")
+PORTAL_KEYS = ("name", "token", "token_env", "output_dir", "base_url")
+
+
+def load_portals_config(
+    path: Union[str, Path],
+    defaults: Optional[dict] = None,
+    overrides: Optional[dict] = None,
+) -> list:
+    """
+    Load and validate a multi-portal config file.
+
+    The file is JSON with a "portals" list and optional "defaults":
+
+        {
+          "defaults": {"use_date_dir": true, "output_format": "cas"},
+          "portals": [
+            {"name": "main", "token_env": "HUBSPOT_MAIN_TOKEN", "output_dir": "snapshots/main"},
+            {"name": "eu", "token": "pat-...", "output_dir": "snapshots/eu", "max_workers": 8}
+          ]
+        }
+
+    Each portal needs a name, an output_dir (relative paths are resolved
+    against the config file's directory) and either a token or token_env,
+    the name of an environment variable holding it, plus an optional
+    base_url for proxies. Any backup option (use_date_dir,
+    use_date_prefix, max_workers, incremental, output_format, fsync,
+    resume, json_style, layout, catalog, metrics, verify) can be set in
+    defaults or per portal.
+
+    Options are applied in order of increasing precedence: defaults, the
+    file's defaults, overrides, then the portal's own keys.
+
+    Args:
+        path: Config file path.
+        defaults: Options applied before the file's defaults.
+        overrides: Options applied over the file's defaults but under
+            per-portal keys, e.g. flags given on the command line.
+
+    Returns:
+        List of portal dicts with name, token, output_dir and options.
+    """
+    config_path = Path(path)
+    with config_path.open("r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    portals = config.get("portals")
+    if not isinstance(portals, list) or not portals:
+        raise ValueError(f"No portals listed in {config_path}")
+
+    allowed = set(BACKUP_OPTIONS) | set(EXTRA_OPTIONS)
+    base = dict(defaults or {})
+    base.update(config.get("defaults") or {})
+    base.update(overrides or {})
+
+    resolved = []
+    names = set()
+    for portal in portals:
+        name = portal.get("name")
+        if not name:
+            raise ValueError("Every portal needs a name.")
+        if name in names:
+            raise ValueError(f"Duplicate portal name: {name}")
+        names.add(name)
+
+        unknown = set(portal) - allowed - set(PORTAL_KEYS)
+        unknown |= set(base) - allowed
+        if unknown:
+            raise ValueError(f"Unknown option(s) for portal {name}: {', '.join(sorted(unknown))}")
+
+        token = portal.get("token")
+        if not token and portal.get("token_env"):
+            token = os.getenv(portal["token_env"])
+            if not token:
+                raise ValueError(f"Environment variable {portal['token_env']} for portal {name} is not set.")
+        if not token:
+            raise ValueError(f"Portal {name} needs a token or token_env.")
+
+        if not portal.get("output_dir"):
+            raise ValueError(f"Portal {name} needs an output_dir.")
+        output_dir = Path(portal["output_dir"])
+        if not output_dir.is_absolute():
+            output_dir = config_path.parent / output_dir
+
+        options = dict(base)
+        options.update({key: value for key, value in portal.items() if key in allowed})
+        resolved.append({
+            "name": name,
+            "token": token,
+            "output_dir": str(output_dir),
+            "base_url": portal.get("base_url"),
+            "options": options,
+        })
+    return resolved
+
+
+def _backup_portal(portal: dict) -> dict:
+    """
+    Back up one portal. Runs in a worker process.
+
+    Errors are reported in the result rather than raised, so one failing
+    portal does not hide the others.
+    """
+    started = time.perf_counter()
+    options = portal["options"]
+    result = {
+        "name": portal["name"],
+        "output_dir": portal["output_dir"],
+        "status": "failed",
+        "snapshot": None,
+        "flows": 0,
+    }
+    flows = []
+
+    try:
+        max_workers = options.get("max_workers", 1)
+        metrics = Metrics() if options.get("metrics") else None
+        with HubSpotClient(
+            token=portal["token"],
+            base_url=portal["base_url"],
+            pool_size=max_workers,
+            metrics=metrics,
+        ) as client:
+            snapshot = backup_all_flows(
+                client=client,
+                output_dir=portal["output_dir"],
+                on_flow=flows.append,
+                catalog=catalog_path(portal["output_dir"]) if options.get("catalog") else None,
+                **{key: options[key] for key in BACKUP_OPTIONS if key in options},
+            )
+        result.update({"status": "ok", "snapshot": str(snapshot), "flows": len(flows)})
+
+        if options.get("verify") and flows:
+            verified = verify_backups(snapshot, max_workers=max_workers)
+            result["verify"] = {key: len(value) for key, value in verified.items()}
+            if verified["failed"]:
+                result["status"] = "failed"
+                result["error"] = "Verification failed"
+    except Exception as e:
+        result["flows"] = len(flows)
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def backup_portals(
+    portals: Union[str, Path, list],
+    max_processes: Optional[int] = None,
+    defaults: Optional[dict] = None,
+    overrides: Optional[dict] = None,
+) -> list:
+    """
+    Back up several HubSpot portals in parallel, one process per portal.
+
+    Each portal runs a normal backup_all_flows with its own client, and
+    therefore its own rate limiter and connection pool, since every portal
+    has an independent API quota.
+
+    Args:
+        portals: Config file path (see load_portals_config) or an already
+            loaded portal list.
+        max_processes: Maximum portals backed up at once. Defaults to the
+            number of portals, capped at the CPU count.
+        defaults: Options applied to every portal unless overridden in the
+            config.
+        overrides: Options applied to every portal over the config's
+            defaults, but under per-portal keys.
+
+    Returns:
+        List of per-portal result dicts (name, output_dir, status,
+        snapshot, flows, seconds, and error or verify counts), in config order.
+    """
+    if not isinstance(portals, list):
+        portals = load_portals_config(portals, defaults, overrides)
+    if max_processes is None:
+        max_processes = min(len(portals), os.cpu_count() or 1)
+    if max_processes < 1:
+        raise ValueError("max_processes must be at least 1.")
+
+    if max_processes == 1 or len(portals) == 1:
+        return [_backup_portal(portal) for portal in portals]
+    with ProcessPoolExecutor(max_workers=max_processes) as executor:
+        return list(executor.map(_backup_portal, portals))
@@ -0,0 +1,138 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date.
+
+    Returns:
+        Delay in seconds, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket that paces requests against a HubSpot quota.
+
+    The bucket starts from the given limits and then follows the
+    X-HubSpot-RateLimit-* headers of each response, so a limiter shared by
+    several clients (or jobs sharing one private app) runs close to the
+    quota without exceeding it.
+    """
+
+    MAX_HEADER = "X-HubSpot-RateLimit-Max"
+    REMAINING_HEADER = "X-HubSpot-RateLimit-Remaining"
+    INTERVAL_HEADER = "X-HubSpot-RateLimit-Interval-Milliseconds"
+
+    def __init__(self, max_requests: int = 100, interval: float = 10.0):
+        """
+        Initialize limiter.
+
+        Args:
+            max_requests: Requests allowed per interval until headers say otherwise.
+            interval: Length of the rate-limit window, in seconds.
+        """
+        if max_requests < 1 or interval <= 0:
+            raise ValueError("max_requests and interval must be positive.")
+        self.max_requests = max_requests
+        self.interval = interval
+        self._tokens = float(max_requests)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Token refill rate in requests per second."""
+        return self.max_requests / self.interval
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(
+                float(self.max_requests), self._tokens + elapsed * self.rate
+            )
+            self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take one token, borrowing against future refills if necessary.
+
+        Returns:
+            Seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Adjust pacing from HubSpot rate-limit response headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping).
+        """
+        max_requests = _int_header(headers, self.MAX_HEADER)
+        interval_ms = _int_header(headers, self.INTERVAL_HEADER)
+        remaining = _int_header(headers, self.REMAINING_HEADER)
+
+        with self._lock:
+            self._refill(time.monotonic())
+            if max_requests and max_requests > 0:
+                self.max_requests = max_requests
+            if interval_ms and interval_ms > 0:
+                self.interval = interval_ms / 1000
+            if remaining is not None:
+                self._tokens = min(self._tokens, float(remaining))
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold all requests for the given time, e.g. after a 429.
+
+        Args:
+            seconds: Time to wait before the next request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
@@ -2,10 +2,26 @@ import argparse
 import json
 import re
 import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Union
 
-from .client import HubSpotClient
+from .cache import DEFAULT_TTL, FlowCache
+from .metrics import Metrics, track_stage
+from .snapshot import is_archive, load_flow, load_index, read_entry, select_entries
+from .storage import atomic_write
+
+if TYPE_CHECKING:
+    from .async_client import AsyncHubSpotClient
+    from .client import HubSpotClient
+
+
+ACTION_OUTPUT_REF = r"(action_outputs?\.action_output_?)(\d+)"
+FETCHED_OBJECT_REF = r"(fetched_object_)(\d+)"
+
+_FETCHED_OBJECT_PATTERN = re.compile(FETCHED_OBJECT_REF)
+_REF_PATTERN = re.compile(f"{ACTION_OUTPUT_REF}|{FETCHED_OBJECT_REF}")
 
 
 def build_datasource_mapping(backup_datasources: list, target_datasources: list) -> dict:
@@ -23,8 +39,8 @@ def build_datasource_mapping(backup_datasources: list, target_datasources: list)
         return (ds.get("objectTypeId"), ds.get("associationTypeId"), ds.get("type"))
 
     def extract_id(name):
-        match = re.search(r'fetched_object_(\d+)', name)
-        return match.group(1) if match else None
+        match = _FETCHED_OBJECT_PATTERN.search(name)
+        return match.group(2) if match else None
 
     target_by_key = {}
     for ds in target_datasources:
@@ -45,6 +61,69 @@ def build_datasource_mapping(backup_datasources: list, target_datasources: list)
     return mapping
 
 
+def _ref_rewriter(action_ids: dict, fetched_objects: dict) -> Callable[[str], str]:
+    """
+    Build a function rewriting action_output and fetched_object refs in a string.
+
+    Both reference kinds are matched by one precompiled pattern, so each
+    string is scanned once and every reference is replaced exactly once
+    (a remapped ID is never remapped again).
+    """
+    def replace(match):
+        if match.group(2) is not None:
+            old_id = match.group(2)
+            return match.group(1) + action_ids.get(old_id, old_id)
+        old_id = match.group(4)
+        return match.group(3) + fetched_objects.get(old_id, old_id)
+
+    sub = _REF_PATTERN.sub
+
+    def rewrite(value: str) -> str:
+        if "action_output" not in value and "fetched_object_" not in value:
+            return value
+        return sub(replace, value)
+
+    return rewrite
+
+
+def _rewrite_tree(obj, rewrite: Callable[[str], str]):
+    """Copy a JSON structure, passing every string value through rewrite."""
+    if isinstance(obj, str):
+        return rewrite(obj)
+    elif isinstance(obj, dict):
+        return {k: _rewrite_tree(v, rewrite) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_rewrite_tree(item, rewrite) for item in obj]
+    return obj
+
+
+def _remap_next_action(container, remap_id: Callable[[str], str]) -> None:
+    """Remap nextActionId of a connection-like dict in place."""
+    if isinstance(container, dict) and "nextActionId" in container:
+        container["nextActionId"] = remap_id(container["nextActionId"])
+
+
+def _remap_action_ids(action: dict, remap_id: Callable[[str], str]) -> None:
+    """Remap the structural action ID fields of a copied action in place."""
+    action["actionId"] = remap_id(action["actionId"])
+
+    _remap_next_action(action.get("connection"), remap_id)
+
+    for branch in action.get("staticBranches") or []:
+        _remap_next_action(branch, remap_id)
+        _remap_next_action(branch.get("connection"), remap_id)
+
+    _remap_next_action(action.get("defaultBranch"), remap_id)
+
+    if "acceptActions" in action:
+        action["acceptActions"] = [remap_id(a) for a in action["acceptActions"]]
+    if "rejectActions" in action:
+        action["rejectActions"] = [remap_id(a) for a in action["rejectActions"]]
+
+    for lb in action.get("listBranches") or []:
+        _remap_next_action(lb.get("connection"), remap_id)
+
+
 def remap_fetched_objects(obj, mapping: dict):
     """
     Recursively remap fetched_object references in a data structure.
@@ -58,26 +137,28 @@ def remap_fetched_objects(obj, mapping: dict):
     """
     if not mapping:
         return obj
-    if isinstance(obj, str):
-        result = obj
-        for old_id, new_id in mapping.items():
-            result = result.replace(f"fetched_object_{old_id}", f"fetched_object_{new_id}")
-        return result
-    elif isinstance(obj, dict):
-        return {k: remap_fetched_objects(v, mapping) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [remap_fetched_objects(item, mapping) for item in obj]
-    return obj
+    return _rewrite_tree(obj, _ref_rewriter({}, mapping))
 
 
-def renumber_actions(backup_actions: list, backup_start_id: str, current_next_available: str) -> tuple:
+def renumber_actions(
+    backup_actions: list,
+    backup_start_id: str,
+    current_next_available: str,
+    fetched_object_mapping: Optional[dict] = None,
+) -> tuple:
     """
     Renumber action IDs to avoid conflicts with existing flow actions.
 
+    Action IDs, branch connections, action_output references and (if a
+    mapping is given) fetched_object references are rewritten in a single
+    walk over the actions.
+
     Args:
         backup_actions: List of actions from backup.
         backup_start_id: Start action ID from backup.
         current_next_available: Next available action ID in target flow.
+        fetched_object_mapping: Optional dict mapping old fetched_object IDs
+            to new IDs, as returned by build_datasource_mapping.
 
     Returns:
         Tuple of (renumbered_actions, new_start_id, new_next_available).
@@ -89,125 +170,64 @@ def renumber_actions(backup_actions: list, backup_start_id: str, current_next_av
     old_to_new = {}
 
     for i, action in enumerate(backup_actions):
-        old_id = action.get("actionId")
-        new_id = str(start_id + i)
-        old_to_new[old_id] = new_id
+        old_to_new[action.get("actionId")] = str(start_id + i)
 
     def remap_id(old_id):
         return old_to_new.get(old_id, old_id)
 
-    def remap_action(action):
-        new_action = dict(action)
-        new_action["actionId"] = remap_id(action["actionId"])
-
-        if "connection" in new_action:
-            conn = dict(new_action["connection"])
-            if "nextActionId" in conn:
-                conn["nextActionId"] = remap_id(conn["nextActionId"])
-            new_action["connection"] = conn
-
-        if "staticBranches" in new_action and new_action["staticBranches"]:
-            new_branches = []
-            for branch in new_action["staticBranches"]:
-                new_branch = dict(branch)
-                if "nextActionId" in new_branch:
-                    new_branch["nextActionId"] = remap_id(new_branch["nextActionId"])
-                if "connection" in new_branch and new_branch["connection"]:
-                    conn = dict(new_branch["connection"])
-                    if "nextActionId" in conn:
-                        conn["nextActionId"] = remap_id(conn["nextActionId"])
-                    new_branch["connection"] = conn
-                new_branches.append(new_branch)
-            new_action["staticBranches"] = new_branches
-
-        if "defaultBranch" in new_action:
-            db = dict(new_action["defaultBranch"])
-            if "nextActionId" in db:
-                db["nextActionId"] = remap_id(db["nextActionId"])
-            new_action["defaultBranch"] = db
-
-        if "acceptActions" in new_action:
-            new_action["acceptActions"] = [remap_id(a) for a in new_action["acceptActions"]]
-        if "rejectActions" in new_action:
-            new_action["rejectActions"] = [remap_id(a) for a in new_action["rejectActions"]]
-
-        if "listBranches" in new_action and new_action["listBranches"]:
-            new_list_branches = []
-            for lb in new_action["listBranches"]:
-                new_lb = dict(lb)
-                if "connection" in new_lb and new_lb["connection"]:
-                    conn = dict(new_lb["connection"])
-                    if "nextActionId" in conn:
-                        conn["nextActionId"] = remap_id(conn["nextActionId"])
-                    new_lb["connection"] = conn
-                new_list_branches.append(new_lb)
-            new_action["listBranches"] = new_list_branches
-
-        return new_action
-
-    renumbered = [remap_action(a) for a in backup_actions]
+    rewrite = _ref_rewriter(old_to_new, fetched_object_mapping or {})
+    renumbered = []
+    for action in backup_actions:
+        new_action = _rewrite_tree(action, rewrite)
+        _remap_action_ids(new_action, remap_id)
+        renumbered.append(new_action)
+
     new_start_id = remap_id(backup_start_id) if backup_start_id else None
     new_next_available = str(start_id + len(backup_actions))
 
-    def remap_action_output_refs(obj):
-        if isinstance(obj, str):
-            def replace_ref(match):
-                prefix = match.group(1)
-                old_id = match.group(2)
-                new_id = old_to_new.get(old_id, old_id)
-                return f"{prefix}{new_id}"
-            return re.sub(r'(action_outputs?\.action_output_?)(\d+)', replace_ref, obj)
-        elif isinstance(obj, dict):
-            return {k: remap_action_output_refs(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [remap_action_output_refs(item) for item in obj]
-        else:
-            return obj
-
-    renumbered = remap_action_output_refs(renumbered)
-
     return renumbered, new_start_id, new_next_available
 
 
-def restore_flow(
-    backup: Union[str, Path, dict],
-    flow_id: Optional[str] = None,
-    name: Optional[str] = None,
-    token: Optional[str] = None,
-    client: Optional[HubSpotClient] = None,
-    dry_run: bool = False,
-) -> Optional[dict]:
+def _load_backup(backup: Union[str, Path, dict], flow_id: Optional[str] = None) -> dict:
     """
-    Restore a HubSpot flow from a backup.
-
-    Args:
-        backup: Path to backup JSON file, or backup dict.
-        flow_id: Target flow ID. Defaults to ID in backup.
-        name: Override flow name. Defaults to name in backup.
-        token: HubSpot token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
-        client: Pre-configured HubSpotClient instance.
-        dry_run: If True, return payload without making API call.
+    Load a backup from a JSON file or snapshot, or return it if already a dict.
 
-    Returns:
-        Updated flow dict, or payload dict if dry_run=True.
+    Snapshot directories (including content-addressed manifests) and
+    archives are resolved through their _index.json and require flow_id.
     """
-    if client is None:
-        client = HubSpotClient(token=token)
-
     if isinstance(backup, (str, Path)):
         backup_path = Path(backup)
+        if backup_path.is_dir() or is_archive(backup_path):
+            if not flow_id:
+                raise ValueError("flow_id is required when restoring from a snapshot.")
+            return load_flow(backup_path, flow_id)
         if not backup_path.is_file():
             raise FileNotFoundError(f"Backup file not found: {backup_path}")
         with backup_path.open("r", encoding="utf-8") as f:
             backup = json.load(f)
+    return backup
+
 
+def _target_flow_id(backup: dict, flow_id: Optional[str]) -> str:
+    """Resolve the flow ID to restore into."""
     target_flow_id = flow_id or backup.get("id")
     if not target_flow_id:
         raise ValueError("flow_id not provided and not present in backup.")
-    target_flow_id = str(target_flow_id)
+    return str(target_flow_id)
 
-    current = client.get_flow(target_flow_id)
 
+def build_restore_body(backup: dict, current: dict, name: Optional[str] = None) -> dict:
+    """
+    Build the PUT body that restores a backup over the current flow.
+
+    Args:
+        backup: Backup flow dict.
+        current: Current flow dict from get_flow.
+        name: Override flow name. Defaults to name in backup.
+
+    Returns:
+        Flow configuration to send with update_flow.
+    """
     current_revision = current.get("revisionId")
     current_type = current.get("type")
     current_name = current.get("name")
@@ -216,16 +236,13 @@ def restore_flow(
     backup_actions = backup.get("actions", [])
     backup_start_id = backup.get("startActionId")
 
-    renumbered_actions, new_start_id, new_next_available = renumber_actions(
-        backup_actions, backup_start_id, current_next_available
-    )
-
     ds_mapping = build_datasource_mapping(
         backup.get("dataSources", []),
         current.get("dataSources", [])
     )
-    if ds_mapping:
-        renumbered_actions = remap_fetched_objects(renumbered_actions, ds_mapping)
+    renumbered_actions, new_start_id, new_next_available = renumber_actions(
+        backup_actions, backup_start_id, current_next_available, ds_mapping
+    )
 
     body = {
         "type": current_type,
@@ -257,10 +274,326 @@ def restore_flow(
         if key in backup:
             body[key] = backup[key]
 
-    if dry_run:
-        return body
+    return body
+
+
+def restore_flow(
+    backup: Union[str, Path, dict],
+    flow_id: Optional[str] = None,
+    name: Optional[str] = None,
+    token: Optional[str] = None,
+    client: Optional["HubSpotClient"] = None,
+    dry_run: bool = False,
+) -> Optional[dict]:
+    """
+    Restore a HubSpot flow from a backup.
+
+    Args:
+        backup: Path to backup JSON file, snapshot directory or archive, or
+            backup dict.
+        flow_id: Target flow ID. Defaults to ID in backup. Also selects the
+            flow when backup is a snapshot directory or archive.
+        name: Override flow name. Defaults to name in backup.
+        token: HubSpot token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
+        client: Pre-configured HubSpotClient instance.
+        dry_run: If True, return payload without making API call.
+
+    Returns:
+        Updated flow dict, or payload dict if dry_run=True.
+    """
+    import requests
+
+    if client is None:
+        from .client import HubSpotClient
+
+        client = HubSpotClient(token=token)
+
+    backup = _load_backup(backup, flow_id)
+    target_flow_id = _target_flow_id(backup, flow_id)
+    metrics = client.metrics
+
+    # A cached current state may be stale; update_flow then drops it and
+    # one retry with a fresh fetch settles the 409.
+    retry_conflict = client.cache is not None
+    while True:
+        with track_stage(metrics, "fetch"):
+            current = client.get_flow(target_flow_id)
+        with track_stage(metrics, "build"):
+            body = build_restore_body(backup, current, name)
+
+        if dry_run:
+            return body
+
+        try:
+            with track_stage(metrics, "put"):
+                return client.update_flow(target_flow_id, body)
+        except requests.HTTPError as e:
+            if not (retry_conflict and _is_conflict(e)):
+                raise
+            retry_conflict = False
+            if metrics is not None:
+                metrics.observe_retry("conflict")
+
+
+def _is_conflict(error: Exception) -> bool:
+    """Check whether an HTTP error was a 409 (flow changed since it was read)."""
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code == 409
+
+
+def _restore_entry(
+    client: "HubSpotClient",
+    entry: dict,
+    content: Optional[bytes],
+    dry_run: bool,
+    max_conflict_retries: int,
+) -> dict:
+    """Restore one snapshot entry and return its report record."""
+    import requests
+
+    flow_id = str(entry["id"])
+    result = {
+        "id": flow_id,
+        "name": entry.get("name"),
+        "filename": entry.get("filename"),
+        "status": "failed",
+        "attempts": 0,
+    }
+    if content is None:
+        result["error"] = f"Backup file not found: {entry.get('filename')}"
+        return result
+
+    try:
+        backup = json.loads(content)
+    except ValueError as e:
+        result["error"] = f"Invalid backup JSON: {e}"
+        return result
+
+    metrics = client.metrics
+    while True:
+        result["attempts"] += 1
+        try:
+            with track_stage(metrics, "fetch"):
+                current = client.get_flow(flow_id)
+            with track_stage(metrics, "build"):
+                body = build_restore_body(backup, current)
+            if dry_run:
+                result["status"] = "dry_run"
+                result["revisionId"] = current.get("revisionId")
+                return result
+            with track_stage(metrics, "put"):
+                updated = client.update_flow(flow_id, body)
+        except requests.HTTPError as e:
+            if _is_conflict(e) and result["attempts"] <= max_conflict_retries:
+                if metrics is not None:
+                    metrics.observe_retry("conflict")
+                continue
+            result["error"] = str(e)
+            return result
+        except (requests.RequestException, ValueError) as e:
+            result["error"] = str(e)
+            return result
+
+        result["status"] = "restored"
+        result["revisionId"] = updated.get("revisionId")
+        return result
+
+
+def restore_snapshot(
+    snapshot: Union[str, Path],
+    flow_ids: Optional[Iterable[Union[str, int]]] = None,
+    name_pattern: Optional[str] = None,
+    token: Optional[str] = None,
+    client: Optional["HubSpotClient"] = None,
+    max_workers: int = 4,
+    max_conflict_retries: int = 3,
+    dry_run: bool = False,
+    report_path: Optional[Union[str, Path]] = None,
+    metrics: Optional[Metrics] = None,
+) -> dict:
+    """
+    Restore many flows from a snapshot directory or archive.
+
+    Flows are selected from the snapshot's _index.json. Each worker fetches
+    the current flow, builds the restore payload and sends the PUT; a 409
+    (the flow changed in between) re-fetches the flow and retries. One
+    failed flow does not stop the others.
+
+    Args:
+        snapshot: Snapshot directory containing _index.json, or an archive.
+        flow_ids: Only restore these flow IDs.
+        name_pattern: Only restore flows whose name matches this glob. With
+            flow_ids, flows matching either filter are restored.
+        token: HubSpot token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
+        client: Pre-configured HubSpotClient instance.
+        max_workers: Number of flows restored concurrently.
+        max_conflict_retries: Retries per flow on revisionId conflicts.
+        dry_run: If True, build payloads without sending them.
+        report_path: If set, write the report as JSON to this path.
+        metrics: Metrics collector used when the client is created here.
+            A given client records into its own metrics.
+
+    Returns:
+        Report dict with 'snapshot', 'timestamp', 'dry_run' and a 'flows'
+        list of per-flow records (id, name, filename, status, attempts,
+        revisionId or error), in index order. With metrics, a 'metrics'
+        key holds Metrics.snapshot().
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+
+    snapshot_path = Path(snapshot)
+    index = load_index(snapshot_path)
+    entries, missing = select_entries(index, flow_ids, name_pattern)
+
+    archive = zipfile.ZipFile(snapshot_path) if is_archive(snapshot_path) else None
+    try:
+        contents = [read_entry(snapshot_path, entry, archive) for entry in entries]
+    finally:
+        if archive is not None:
+            archive.close()
+
+    owns_client = client is None
+    if client is None:
+        from .client import HubSpotClient
+
+        client = HubSpotClient(token=token, pool_size=max_workers, metrics=metrics)
+    metrics = client.metrics
+
+    def restore_one(item: tuple) -> dict:
+        entry, content = item
+        return _restore_entry(client, entry, content, dry_run, max_conflict_retries)
+
+    try:
+        items = list(zip(entries, contents))
+        with track_stage(metrics, "restore"):
+            if max_workers == 1:
+                results = [restore_one(item) for item in items]
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    results = list(executor.map(restore_one, items))
+    finally:
+        if owns_client:
+            client.close()
+
+    for flow_id in missing:
+        results.append({
+            "id": flow_id,
+            "name": None,
+            "filename": None,
+            "status": "failed",
+            "attempts": 0,
+            "error": f"Flow {flow_id} not found in snapshot",
+        })
+
+    report = {
+        "snapshot": str(snapshot_path),
+        "timestamp": index.get("timestamp"),
+        "dry_run": dry_run,
+        "flows": results,
+    }
+    if metrics is not None:
+        report["metrics"] = metrics.snapshot()
+
+    if report_path is not None:
+        report_file = Path(report_path)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(report_file, json.dumps(report, indent=2).encode("utf-8"))
+
+    return report
+
+
+async def async_restore_flow(
+    backup: Union[str, Path, dict],
+    flow_id: Optional[str] = None,
+    name: Optional[str] = None,
+    token: Optional[str] = None,
+    client: Optional["AsyncHubSpotClient"] = None,
+    dry_run: bool = False,
+) -> Optional[dict]:
+    """
+    Restore a HubSpot flow from a backup using asyncio.
+
+    Args:
+        backup: Path to backup JSON file, snapshot directory or archive, or
+            backup dict.
+        flow_id: Target flow ID. Defaults to ID in backup. Also selects the
+            flow when backup is a snapshot directory or archive.
+        name: Override flow name. Defaults to name in backup.
+        token: HubSpot token. Falls back to HUBSPOT_AUTOMATION_TOKEN env var.
+        client: Pre-configured AsyncHubSpotClient instance.
+        dry_run: If True, return payload without making API call.
+
+    Returns:
+        Updated flow dict, or payload dict if dry_run=True.
+    """
+    owns_client = client is None
+    if client is None:
+        from .async_client import AsyncHubSpotClient
+
+        client = AsyncHubSpotClient(token=token)
+
+    try:
+        backup = _load_backup(backup, flow_id)
+        target_flow_id = _target_flow_id(backup, flow_id)
+
+        metrics = client.metrics
+
+        with track_stage(metrics, "fetch"):
+            current = await client.get_flow(target_flow_id)
+        with track_stage(metrics, "build"):
+            body = build_restore_body(backup, current, name)
+
+        if dry_run:
+            return body
+
+        with track_stage(metrics, "put"):
+            return await client.update_flow(target_flow_id, body)
+    finally:
+        if owns_client:
+            await client.aclose()
+
+
+def _restore_snapshot_cli(args: argparse.Namespace, snapshot: Path, client: "HubSpotClient") -> None:
+    """Run a bulk restore from the workflows-restore CLI."""
+    from .backup import get_timestamp
+
+    flow_ids = [flow_id.strip() for value in args.only for flow_id in value.split(",") if flow_id.strip()]
+    report_path = Path(args.report) if args.report else Path.cwd() / f"restore_report_{get_timestamp()}.json"
+
+    print(f"Restoring from snapshot: {snapshot}")
+    if flow_ids:
+        print(f"  flow IDs: {', '.join(flow_ids)}")
+    if args.match:
+        print(f"  name pattern: {args.match}")
+
+    try:
+        report = restore_snapshot(
+            snapshot,
+            flow_ids=flow_ids,
+            name_pattern=args.match,
+            client=client,
+            max_workers=args.workers,
+            dry_run=args.dry,
+            report_path=report_path,
+        )
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    failed = 0
+    for result in report["flows"]:
+        if result["status"] == "failed":
+            failed += 1
+            print(f"  FAILED  {result['id']} {result['name']}: {result.get('error')}")
+        else:
+            print(f"  {result['status'].upper():<7} {result['id']} {result['name']} (revisionId {result.get('revisionId')})")
 
-    return client.update_flow(target_flow_id, body)
+    label = "Planned" if args.dry else "Restored"
+    print(f"\n{label}: {len(report['flows']) - failed}, Failed: {failed}")
+    print(f"Report written to: {report_path}")
+    if failed:
+        sys.exit(1)
 
 
 def main() -> None:
@@ -268,26 +601,101 @@ def main() -> None:
     parser = argparse.ArgumentParser(
         description="Restore a HubSpot automation flow from a backup JSON file."
     )
-    parser.add_argument("backup_path", help="Path to the backup JSON file")
+    parser.add_argument(
+        "backup_path",
+        help=(
+            "Path to the backup JSON file, or a snapshot directory/archive "
+            "(restores one flow with --flow-id, otherwise every selected flow)"
+        ),
+    )
     parser.add_argument("--flow-id", dest="flow_id", help="Override target flowId")
     parser.add_argument("--name", dest="name", help="Override flow name")
     parser.add_argument("--dry", action="store_true", help="Show payload without sending")
+    parser.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        metavar="IDS",
+        help="Bulk restore: only these comma-separated flow IDs (repeatable)",
+    )
+    parser.add_argument(
+        "--match",
+        metavar="GLOB",
+        help="Bulk restore: only flows whose name matches this glob pattern",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Bulk restore: number of flows restored concurrently (default: 4)",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="PATH",
+        help="Bulk restore: report path (default: ./restore_report_<timestamp>.json)",
+    )
+    parser.add_argument(
+        "--metrics-textfile",
+        metavar="PATH",
+        help="Write request and stage metrics as a Prometheus textfile",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="Keep fetched current flows in PATH so repeated (dry) runs reuse them",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_TTL,
+        metavar="SECONDS",
+        help="Reuse cached flows without a request for this long, then "
+             f"revalidate them (default: {DEFAULT_TTL:g})",
+    )
 
     args = parser.parse_args()
 
     backup_file = Path(args.backup_path)
-    if not backup_file.is_file():
+    if not backup_file.exists():
         print(f"Backup file not found: {backup_file}", file=sys.stderr)
         sys.exit(1)
 
+    if args.workers < 1:
+        print("Error: --workers must be at least 1.", file=sys.stderr)
+        sys.exit(1)
+
+    bulk = (backup_file.is_dir() or is_archive(backup_file)) and not args.flow_id
+    if not bulk and (args.only or args.match):
+        print("Error: --only and --match need a snapshot directory or archive without --flow-id.", file=sys.stderr)
+        sys.exit(1)
+    if bulk and args.name:
+        print("Error: --name cannot be used when restoring a whole snapshot.", file=sys.stderr)
+        sys.exit(1)
+
+    from .client import HubSpotClient
+
+    metrics = Metrics() if args.metrics_textfile else None
+    cache = FlowCache(args.cache, ttl=args.cache_ttl)
     try:
-        client = HubSpotClient()
+        client = HubSpotClient(pool_size=args.workers if bulk else 10, metrics=metrics, cache=cache)
     except ValueError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    with backup_file.open("r", encoding="utf-8") as f:
-        backup = json.load(f)
+    if bulk:
+        try:
+            _restore_snapshot_cli(args, backup_file, client)
+        finally:
+            cache.save()
+            if metrics is not None:
+                metrics.write_prometheus(args.metrics_textfile)
+        return
+
+    try:
+        backup = _load_backup(backup_file, args.flow_id)
+    except (KeyError, ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
     flow_id = args.flow_id or backup.get("id")
     if not flow_id:
@@ -311,10 +719,16 @@ def main() -> None:
         result = restore_flow(backup, flow_id=args.flow_id, name=args.name, client=client, dry_run=True)
         print("\n[DRY RUN] Would send PUT /automation/v4/flows/{flowId} with body:")
         print(json.dumps(result, indent=2))
+        cache.save()
+        if metrics is not None:
+            metrics.write_prometheus(args.metrics_textfile)
         return
 
     print("\nSending PUT to update flow...")
     updated = restore_flow(backup, flow_id=args.flow_id, name=args.name, client=client)
+    cache.save()
+    if metrics is not None:
+        metrics.write_prometheus(args.metrics_textfile)
 
     print("\nUpdate complete. New flow summary:")
     print(f"  id: {updated.get('id')}")
@@ -0,0 +1,393 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+from .catalog import Catalog, catalog_path
+from .metrics import is_report, report_path
+from .snapshot import INDEX_NAME, entry_path, is_archive, load_index
+from .storage import JOURNAL_NAME, Journal
+from .verify import hash_file
+
+TIMESTAMP_FORMAT = "%Y_%m_%d_%H%M%S"
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def _load_runs(output_dir: Path) -> list:
+    """
+    Load the index of every completed dated run directly under output_dir.
+
+    Runs that are still in progress or were interrupted (no _index.json
+    yet) are not listed, so they are never pruned.
+
+    Returns:
+        List of run dicts (snapshot, timestamp, time, format, index), newest first.
+    """
+    runs = []
+    for path in output_dir.iterdir():
+        if is_report(path):
+            continue
+        if path.is_dir():
+            if not (path / INDEX_NAME).is_file():
+                continue
+        elif not (path.suffix == ".zip" and is_archive(path)):
+            continue
+        try:
+            index = load_index(path)
+        except (OSError, ValueError, zipfile.BadZipFile):
+            continue
+        timestamp = index.get("timestamp") or path.stem
+        runs.append({
+            "snapshot": path,
+            "timestamp": timestamp,
+            "time": _parse_timestamp(timestamp) or _parse_timestamp(path.stem),
+            "format": index.get("format", "files"),
+            "index": index,
+        })
+    runs.sort(key=lambda run: (run["timestamp"], run["snapshot"].name), reverse=True)
+    return runs
+
+
+def _keep_per_period(runs: list, count: int, period, reason: str, reasons: dict) -> None:
+    """Keep the newest run of each of the `count` most recent periods."""
+    seen = set()
+    for run in runs:
+        if len(seen) >= count:
+            break
+        if run["time"] is None:
+            continue
+        key = period(run["time"])
+        if key not in seen:
+            seen.add(key)
+            reasons[run["snapshot"]].append(reason)
+
+
+def plan_retention(
+    output_dir: Union[str, Path],
+    keep_last: int = 1,
+    daily: int = 7,
+    weekly: int = 4,
+    monthly: int = 12,
+    keep_flows: bool = True,
+) -> dict:
+    """
+    Decide which dated runs to keep with a grandfather-father-son policy.
+
+    Only the runs' _index.json files are read. A run is kept if it is one
+    of the keep_last newest runs, the newest run of one of the `daily`
+    most recent days, `weekly` most recent ISO weeks or `monthly` most
+    recent months, or (with keep_flows) the newest run holding some flow,
+    so the last known version of a flow deleted from the portal survives.
+    Runs whose timestamp cannot be parsed are always kept.
+
+    Args:
+        output_dir: Snapshot output root holding the dated runs.
+        keep_last: Number of newest runs to keep.
+        daily: Number of days to keep one run for.
+        weekly: Number of weeks to keep one run for.
+        monthly: Number of months to keep one run for.
+        keep_flows: If True, keep the newest run that holds each flow.
+
+    Returns:
+        Dict with 'keep' and 'prune' lists of {snapshot, timestamp,
+        format, reasons} records, newest first.
+    """
+    if min(keep_last, daily, weekly, monthly) < 0:
+        raise ValueError("Retention counts cannot be negative.")
+    if not (keep_last or daily or weekly or monthly):
+        raise ValueError("At least one of keep_last, daily, weekly or monthly must be set.")
+
+    runs = _load_runs(Path(output_dir))
+    reasons = {run["snapshot"]: [] for run in runs}
+
+    for run in runs[:keep_last]:
+        reasons[run["snapshot"]].append("last")
+    _keep_per_period(runs, daily, lambda t: t.date(), "daily", reasons)
+    _keep_per_period(runs, weekly, lambda t: t.isocalendar()[:2], "weekly", reasons)
+    _keep_per_period(runs, monthly, lambda t: (t.year, t.month), "monthly", reasons)
+
+    for run in runs:
+        if run["time"] is None:
+            reasons[run["snapshot"]].append("unknown_timestamp")
+
+    if keep_flows:
+        seen = set()
+        for run in runs:
+            flow_ids = {str(e["id"]) for e in run["index"].get("flows", []) if e.get("id") and e.get("hash")}
+            if flow_ids - seen:
+                reasons[run["snapshot"]].append("last_flow_version")
+                seen |= flow_ids
+
+    plan = {"keep": [], "prune": []}
+    for run in runs:
+        record = {
+            "snapshot": str(run["snapshot"]),
+            "timestamp": run["timestamp"],
+            "format": run["format"],
+            "reasons": reasons[run["snapshot"]],
+        }
+        plan["keep" if record["reasons"] else "prune"].append(record)
+    return plan
+
+
+def compact_snapshots(output_dir: Union[str, Path], dry_run: bool = False) -> dict:
+    """
+    Hard-link duplicate workflow files in dated runs to their newest copy.
+
+    A file in an older 'files' run whose index hash equals a newer run's
+    entry is replaced by a hard link to the newer file, so each distinct
+    body is stored once while every run stays complete. Both files are
+    re-hashed first and linked only if they still match the index hash, so
+    a stale or hand-edited index never replaces a good copy.
+    Content-addressed runs are already deduplicated and archives are
+    self-contained, so both are skipped.
+
+    Args:
+        output_dir: Snapshot output root holding the dated runs.
+        dry_run: If True, only count what would be linked.
+
+    Returns:
+        Dict with the number of files 'linked' and the 'bytes' reclaimed
+        (files that had no other hard link; a dry run can undercount).
+    """
+    return _compact_runs(_load_runs(Path(output_dir)), dry_run)
+
+
+def _matches(path: Path, digest: str) -> bool:
+    """Check that a file exists and its bytes hash to digest."""
+    try:
+        return hash_file(path) == digest
+    except OSError:
+        return False
+
+
+def _compact_runs(runs: list, dry_run: bool) -> dict:
+    """Hard-link duplicate files across runs (newest first) to their newest copy."""
+    result = {"linked": 0, "bytes": 0}
+    newest: dict = {}
+
+    for run in runs:
+        if run["format"] != "files" or is_archive(run["snapshot"]):
+            continue
+        for entry in run["index"].get("flows", []):
+            digest = entry.get("hash")
+            if not digest or not entry.get("filename"):
+                continue
+            if is_report(entry["filename"]):
+                continue
+            path = entry_path(run["snapshot"], entry)
+            source = newest.get(digest)
+            if source is None:
+                if _matches(path, digest):
+                    newest[digest] = path
+                continue
+            try:
+                stat = path.stat()
+                source_stat = source.stat()
+            except OSError:
+                continue
+            if (stat.st_dev, stat.st_ino) == (source_stat.st_dev, source_stat.st_ino):
+                continue
+            if stat.st_size != source_stat.st_size or not _matches(path, digest):
+                continue
+
+            if not dry_run:
+                temp = path.with_name(f".{path.name}.link")
+                try:
+                    temp.unlink(missing_ok=True)
+                    os.link(source, temp)
+                    os.replace(temp, path)
+                except OSError:
+                    temp.unlink(missing_ok=True)
+                    continue
+            result["linked"] += 1
+            if stat.st_nlink == 1:
+                result["bytes"] += stat.st_size
+    return result
+
+
+def _referenced_objects(output_dir: Path, exclude: set) -> set:
+    """Resolve every blob referenced by a run's index or an unfinished run's journal."""
+    referenced = set()
+    for index_path in output_dir.rglob(INDEX_NAME):
+        if str(index_path.parent) in exclude:
+            continue
+        try:
+            index = load_index(index_path.parent)
+        except (OSError, ValueError):
+            continue
+        for entry in index.get("flows", []):
+            if entry.get("filename"):
+                referenced.add(os.path.normpath(entry_path(index_path.parent, entry)))
+    for journal_path in output_dir.rglob(JOURNAL_NAME):
+        _, entries = Journal.read(journal_path)
+        for entry in entries.values():
+            if entry.get("filename"):
+                referenced.add(os.path.normpath(entry_path(journal_path.parent, entry)))
+    return referenced
+
+
+def _collect_objects(output_dir: Path, pruned: set, dry_run: bool) -> dict:
+    """Delete content-addressed blobs no remaining run refers to."""
+    result = {"objects": 0, "bytes": 0}
+    objects_dir = output_dir / "objects"
+    if not objects_dir.is_dir():
+        return result
+
+    referenced = _referenced_objects(output_dir, pruned)
+    for blob in objects_dir.glob("*/*.json"):
+        if os.path.normpath(blob) in referenced:
+            continue
+        result["objects"] += 1
+        result["bytes"] += blob.stat().st_size
+        if not dry_run:
+            blob.unlink()
+    return result
+
+
+def apply_retention(
+    output_dir: Optional[Union[str, Path]] = None,
+    keep_last: int = 1,
+    daily: int = 7,
+    weekly: int = 4,
+    monthly: int = 12,
+    keep_flows: bool = True,
+    compact: bool = True,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Prune dated runs by retention policy and compact the runs that remain.
+
+    Pruned runs are deleted (with their metrics report) and forgotten by
+    the snapshot catalog if one exists. Content-addressed blobs left
+    unreferenced are then removed, and duplicate files in the kept 'files'
+    runs are hard-linked together (see compact_snapshots). Do not run this
+    while a backup is writing into the same output root.
+
+    Args:
+        output_dir: Snapshot output root. Defaults to ./snapshots/.
+        keep_last: Number of newest runs to keep.
+        daily: Number of days to keep one run for.
+        weekly: Number of weeks to keep one run for.
+        monthly: Number of months to keep one run for.
+        keep_flows: If True, keep the newest run that holds each flow.
+        compact: If True, hard-link duplicate files in the kept runs.
+        dry_run: If True, report what would be done without changing anything.
+
+    Returns:
+        Dict with the plan_retention 'keep' and 'prune' lists, the
+        'objects' collection result and the 'compacted' result (or None).
+    """
+    root = Path.cwd() / "snapshots" if output_dir is None else Path(output_dir)
+    if not root.is_dir():
+        raise FileNotFoundError(f"Output directory not found: {root}")
+
+    plan = plan_retention(root, keep_last, daily, weekly, monthly, keep_flows)
+
+    if not dry_run and plan["prune"]:
+        catalog = Catalog(catalog_path(root)) if catalog_path(root).is_file() else None
+        try:
+            for record in plan["prune"]:
+                snapshot = Path(record["snapshot"])
+                if catalog is not None:
+                    catalog.remove_run(snapshot)
+                if snapshot.is_dir():
+                    shutil.rmtree(snapshot)
+                else:
+                    report_path(snapshot).unlink(missing_ok=True)
+                    snapshot.unlink()
+        finally:
+            if catalog is not None:
+                catalog.close()
+
+    result = dict(plan)
+    pruned = {record["snapshot"] for record in plan["prune"]}
+    result["objects"] = _collect_objects(root, pruned, dry_run) if pruned else {"objects": 0, "bytes": 0}
+    if compact:
+        kept = {record["snapshot"] for record in plan["keep"]}
+        runs = [run for run in _load_runs(root) if str(run["snapshot"]) in kept]
+        result["compacted"] = _compact_runs(runs, dry_run)
+    else:
+        result["compacted"] = None
+    return result
+
+
+def main() -> None:
+    """CLI entry point for workflows-retention command."""
+    parser = argparse.ArgumentParser(
+        description="Prune dated workflow snapshots by retention policy and "
+                    "compact duplicate files in the runs that are kept."
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        type=str,
+        default=None,
+        help="Snapshot output root holding the dated runs (default: ./snapshots/)"
+    )
+    parser.add_argument("--keep-last", type=int, default=1, help="Newest runs to keep (default: 1)")
+    parser.add_argument("--daily", type=int, default=7, help="Days to keep one run for (default: 7)")
+    parser.add_argument("--weekly", type=int, default=4, help="Weeks to keep one run for (default: 4)")
+    parser.add_argument("--monthly", type=int, default=12, help="Months to keep one run for (default: 12)")
+    parser.add_argument(
+        "--no-keep-flows",
+        dest="keep_flows",
+        action="store_false",
+        help="Don't keep the newest run holding each flow (by default the last "
+             "version of a flow deleted from the portal is kept)"
+    )
+    parser.add_argument(
+        "--no-compact",
+        dest="compact",
+        action="store_false",
+        help="Don't hard-link duplicate files in the kept runs"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be done without changing anything")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    try:
+        result = apply_retention(
+            output_dir=args.output_dir,
+            keep_last=args.keep_last,
+            daily=args.daily,
+            weekly=args.weekly,
+            monthly=args.monthly,
+            keep_flows=args.keep_flows,
+            compact=args.compact,
+            dry_run=args.dry_run,
+        )
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    prefix = "Would prune" if args.dry_run else "Pruned"
+    print(f"Kept ({len(result['keep'])}):")
+    for record in result["keep"]:
+        print(f"  {record['snapshot']} ({', '.join(record['reasons'])})")
+    print(f"{prefix} ({len(result['prune'])}):")
+    for record in result["prune"]:
+        print(f"  {record['snapshot']}")
+    if result["objects"]["objects"]:
+        print(f"Unreferenced objects: {result['objects']['objects']} ({result['objects']['bytes']} bytes)")
+    if result["compacted"] is not None:
+        compacted = result["compacted"]
+        print(f"Compacted: {compacted['linked']} duplicate files ({compacted['bytes']} bytes)")
+
+
+if __name__ == "__main__":
+    main()
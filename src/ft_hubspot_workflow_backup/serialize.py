@@ -0,0 +1,101 @@
+import json
+from importlib.util import find_spec
+from typing import Optional
+
+# orjson is an optional speed-up; it is only imported once a flow is
+# serialized, so offline commands don't pay for loading it.
+HAS_ORJSON = find_spec("orjson") is not None
+
+STYLES = ("indent", "compact")
+BACKENDS = ("json", "orjson")
+# Exact types _has_float can skip without further checks.
+_SCALARS = frozenset((str, int, bool, type(None)))
+
+
+def available_backends() -> tuple:
+    """Return the serializer backends that can be used in this environment."""
+    return BACKENDS if HAS_ORJSON else ("json",)
+
+
+def default_backend() -> str:
+    """Return the fastest available backend: orjson if installed, else json."""
+    return "orjson" if HAS_ORJSON else "json"
+
+
+def _json_bytes(details: dict, style: str) -> bytes:
+    """Serialize with the standard library; this defines the canonical bytes."""
+    if style == "compact":
+        return json.dumps(details, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return json.dumps(details, indent=2, sort_keys=True).encode("utf-8")
+
+
+def _has_float(obj) -> bool:
+    """Check whether any value in a JSON structure is a float."""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        for value in item.values() if isinstance(item, dict) else item:
+            if type(value) in _SCALARS:
+                continue
+            if isinstance(value, float):
+                return True
+            if isinstance(value, (dict, list, tuple)):
+                stack.append(value)
+    return False
+
+
+def _orjson_bytes(details: dict, style: str) -> Optional[bytes]:
+    """
+    Serialize with orjson, or return None where its output could differ.
+
+    orjson writes non-ASCII characters and DEL unescaped, formats floats
+    differently (1e16 vs 1e+16, 0.00001 vs 1e-05, null for NaN) and rejects
+    integers beyond 64 bits, so those flows are left to the json module.
+    """
+    import orjson
+
+    if _has_float(details):
+        return None
+    option = orjson.OPT_SORT_KEYS
+    if style == "indent":
+        option |= orjson.OPT_INDENT_2
+    try:
+        content = orjson.dumps(details, option=option)
+    except TypeError:
+        return None
+    if not content.isascii() or b"\x7f" in content:
+        return None
+    return content
+
+
+def serialize_flow(details: dict, style: str = "indent", backend: Optional[str] = None) -> bytes:
+    """
+    Serialize a normalized flow to its canonical on-disk bytes.
+
+    Every backend produces exactly the bytes of the standard library's
+    json.dumps with sorted keys and ASCII escapes, so hashes in _index.json
+    don't depend on which backend wrote a file.
+
+    Args:
+        details: Normalized flow dict.
+        style: "indent" (2-space indented, the default) or "compact" (no
+            whitespace, for archival). The two styles hash differently.
+        backend: "json" or "orjson". Defaults to default_backend().
+
+    Returns:
+        UTF-8 encoded JSON, key-sorted.
+    """
+    if style not in STYLES:
+        raise ValueError(f"Unknown JSON style: {style}")
+    if backend is None:
+        backend = default_backend()
+
+    if backend == "orjson":
+        if not HAS_ORJSON:
+            raise ValueError("The orjson backend requires the orjson package.")
+        content = _orjson_bytes(details, style)
+        if content is not None:
+            return content
+    elif backend != "json":
+        raise ValueError(f"Unknown serializer backend: {backend}")
+    return _json_bytes(details, style)
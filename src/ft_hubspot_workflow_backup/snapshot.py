@@ -0,0 +1,167 @@
+import fnmatch
+import json
+import zipfile
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+INDEX_NAME = "_index.json"
+
+
+def is_archive(snapshot: Union[str, Path]) -> bool:
+    """
+    Check whether a snapshot path is a single-file archive.
+
+    Args:
+        snapshot: Snapshot directory or archive path.
+
+    Returns:
+        True if the path is a zip archive written with the archive format.
+    """
+    path = Path(snapshot)
+    return path.is_file() and zipfile.is_zipfile(path)
+
+
+def load_index(snapshot: Union[str, Path]) -> dict:
+    """
+    Load a snapshot's _index.json.
+
+    Args:
+        snapshot: Snapshot directory containing _index.json, or an archive.
+
+    Returns:
+        Parsed index dict.
+    """
+    path = Path(snapshot)
+    if is_archive(path):
+        with zipfile.ZipFile(path) as archive:
+            try:
+                return json.loads(archive.read(INDEX_NAME))
+            except KeyError:
+                raise FileNotFoundError(f"Index file not found in archive: {path}")
+
+    index_path = path / INDEX_NAME
+    if not index_path.exists():
+        raise FileNotFoundError(f"Index file not found: {index_path}")
+    with index_path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_entry(index: dict, flow_id: Union[str, int]) -> Optional[dict]:
+    """
+    Find the index entry for a flow ID.
+
+    Args:
+        index: Parsed _index.json.
+        flow_id: HubSpot flow ID.
+
+    Returns:
+        Index entry dict, or None if the flow is not in the snapshot.
+    """
+    for entry in index.get("flows", []):
+        if str(entry.get("id")) == str(flow_id):
+            return entry
+    return None
+
+
+def select_entries(
+    index: dict,
+    flow_ids: Optional[Iterable[Union[str, int]]] = None,
+    name_pattern: Optional[str] = None,
+) -> tuple:
+    """
+    Pick index entries by flow ID and/or name glob.
+
+    Args:
+        index: Parsed _index.json.
+        flow_ids: Flow IDs to select.
+        name_pattern: fnmatch-style pattern matched against flow names.
+
+    Returns:
+        Tuple of (selected entries in index order, requested IDs missing
+        from the snapshot). Every entry is selected when neither filter
+        is given.
+    """
+    entries = [entry for entry in index.get("flows", []) if entry.get("id")]
+    wanted = {str(flow_id) for flow_id in flow_ids} if flow_ids else set()
+    if not wanted and not name_pattern:
+        return entries, []
+
+    selected = [
+        entry for entry in entries
+        if str(entry["id"]) in wanted
+        or (name_pattern and fnmatch.fnmatch(entry.get("name") or "", name_pattern))
+    ]
+    found = {str(entry["id"]) for entry in entries}
+    return selected, sorted(wanted - found)
+
+
+def entry_path(snapshot_dir: Union[str, Path], entry: dict) -> Path:
+    """
+    Resolve the file holding an index entry's flow body.
+
+    Works for plain snapshots and content-addressed manifests, whose
+    filenames are paths relative to the snapshot directory.
+
+    Args:
+        snapshot_dir: Snapshot directory containing _index.json.
+        entry: Index entry dict.
+
+    Returns:
+        Path to the flow JSON.
+    """
+    return Path(snapshot_dir) / entry["filename"]
+
+
+def read_entry(
+    snapshot: Union[str, Path],
+    entry: dict,
+    archive: Optional[zipfile.ZipFile] = None,
+) -> Optional[bytes]:
+    """
+    Read the stored bytes of one index entry.
+
+    Archive members are read through the zip central directory, so only
+    the requested flow is decompressed.
+
+    Args:
+        snapshot: Snapshot directory or archive path.
+        entry: Index entry dict.
+        archive: Already opened archive to read from, for repeated reads.
+
+    Returns:
+        Flow JSON bytes, or None if the entry's file is missing.
+    """
+    if archive is None and is_archive(snapshot):
+        with zipfile.ZipFile(snapshot) as opened:
+            return read_entry(snapshot, entry, opened)
+    if archive is not None:
+        try:
+            return archive.read(entry["filename"])
+        except KeyError:
+            return None
+
+    path = entry_path(snapshot, entry)
+    if not path.is_file():
+        return None
+    return path.read_bytes()
+
+
+def load_flow(snapshot: Union[str, Path], flow_id: Union[str, int]) -> dict:
+    """
+    Load one flow from a snapshot by ID.
+
+    Args:
+        snapshot: Snapshot directory containing _index.json, or an archive.
+        flow_id: HubSpot flow ID.
+
+    Returns:
+        Backed up flow dict.
+    """
+    index = load_index(snapshot)
+    entry = find_entry(index, flow_id)
+    if entry is None:
+        raise KeyError(f"Flow {flow_id} not found in snapshot: {snapshot}")
+    content = read_entry(snapshot, entry)
+    if content is None:
+        raise FileNotFoundError(f"Backup file not found: {entry['filename']}")
+    return json.loads(content)
@@ -0,0 +1,600 @@
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import threading
+import uuid
+import zipfile
+from contextlib import nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from .serialize import serialize_flow
+from .snapshot import INDEX_NAME, entry_path, is_archive, read_entry
+
+if TYPE_CHECKING:
+    from .metrics import Metrics
+
+JOURNAL_NAME = "_journal.jsonl"
+
+
+def _temp_path(target: Path) -> Path:
+    """Return an unused temporary path next to target for an atomic rename."""
+    return target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+
+
+def atomic_write(path: Path, content: bytes) -> None:
+    """
+    Write bytes so readers see either the old file or the complete new one.
+
+    Args:
+        path: Destination file.
+        content: Bytes to write.
+    """
+    tmp = _temp_path(path)
+    try:
+        with tmp.open("xb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def fsync_path(path: Path) -> None:
+    """Flush a file or directory to stable storage."""
+    flags = os.O_RDONLY
+    if path.is_dir():
+        if os.name == "nt":
+            return
+        flags |= getattr(os, "O_DIRECTORY", 0)
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Atomically hard-link source to target, copying if links are unsupported."""
+    tmp = _temp_path(target)
+    try:
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copy2(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class FileStore:
+    """Writes one JSON file per flow into the run directory."""
+
+    format = "files"
+
+    def __init__(
+        self,
+        run_dir: Path,
+        fsync: bool = False,
+        metrics: Optional["Metrics"] = None,
+        json_style: str = "indent",
+        layout: str = "flat",
+    ):
+        """
+        Initialize store.
+
+        Args:
+            run_dir: Directory for this backup run.
+            fsync: If True, flush every written file to disk before the index
+                is committed.
+            metrics: Metrics collector timing the serialize, hash and write stages.
+            json_style: "indent" or "compact" canonical JSON (see serialize_flow).
+            layout: File layout the backup filenames follow ("flat", "id" or
+                "hashed"), recorded in _index.json.
+        """
+        self.run_dir = run_dir
+        self.snapshot_path = run_dir
+        self.fsync = fsync
+        self.metrics = metrics
+        self.json_style = json_style
+        self.layout = layout
+        self._written: list = []
+        self._dirs: set = set()
+        self._names: set = {INDEX_NAME}
+        self._claimed: dict = {}
+        self._lock = threading.Lock()
+
+    def claim(self, flow_id: str, filename: str) -> str:
+        """
+        Reserve a backup filename for a flow in this run.
+
+        Flows whose names slugify alike would otherwise write the same file
+        (with the "flat" layout); the later claim gets -<flow_id> appended
+        to its stem instead. Claims are kept per flow, so claiming again
+        returns the same filename.
+
+        Args:
+            flow_id: ID of the flow.
+            filename: Filename the flow would get, relative to the run directory.
+
+        Returns:
+            The filename to write the flow to.
+        """
+        with self._lock:
+            claimed = self._claimed.get(flow_id)
+            if claimed is not None:
+                return claimed
+            if filename in self._names:
+                stem, ext = posixpath.splitext(filename)
+                stem = f"{stem}-{re.sub(r'[^0-9A-Za-z_-]', '_', flow_id)}"
+                filename = f"{stem}{ext}"
+                counter = 2
+                while filename in self._names:
+                    filename = f"{stem}-{counter}{ext}"
+                    counter += 1
+            self._names.add(filename)
+            self._claimed[flow_id] = filename
+            return filename
+
+    def _stage(self, name: str):
+        """Time a stage in metrics, if any."""
+        return self.metrics.stage(name) if self.metrics is not None else nullcontext()
+
+    def _serialize(self, details: dict) -> bytes:
+        with self._stage("serialize"):
+            return serialize_flow(details, self.json_style)
+
+    def _hash(self, content: bytes) -> str:
+        with self._stage("hash"):
+            return hashlib.sha256(content).hexdigest()
+
+    def _ensure_parent(self, path: Path) -> None:
+        """Create a shard subdirectory of the run directory once per run."""
+        parent = path.parent
+        if parent == self.run_dir or parent in self._dirs:
+            return
+        parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._dirs.add(parent)
+
+    def _commit(self, path: Path, content: bytes) -> None:
+        """Atomically write content and remember it for the final fsync."""
+        atomic_write(path, content)
+        if self.fsync:
+            with self._lock:
+                self._written.append(path)
+
+    def write(self, filename: str, details: dict) -> dict:
+        """
+        Serialize, hash and atomically write a normalized flow in one pass.
+
+        Args:
+            filename: Backup filename for the flow, relative to the run
+                directory (may include a shard subdirectory).
+            details: Normalized flow dict.
+
+        Returns:
+            Dict with the index 'filename' and 'hash'.
+        """
+        content = self._serialize(details)
+        path = self.run_dir / filename
+        with self._stage("write"):
+            self._ensure_parent(path)
+            self._commit(path, content)
+        return {"filename": filename, "hash": self._hash(content)}
+
+    def carry_forward(
+        self, filename: str, previous: dict, previous_snapshot: Path
+    ) -> Optional[dict]:
+        """
+        Reuse an unchanged flow from a previous run.
+
+        The old file is hard-linked into this run (copied if linking is not
+        supported, or extracted if the previous run is an archive). Nothing
+        is written when the path is unchanged. The linked bytes are checked
+        against the previous hash, since the old file may have been
+        replaced since its index was written (for instance by this run,
+        when runs share a directory).
+
+        Args:
+            filename: Backup filename for the flow in this run.
+            previous: Index entry from the previous run.
+            previous_snapshot: Snapshot directory or archive of the previous run.
+
+        Returns:
+            Dict with 'filename' and 'hash', or None if the old file is
+            missing or no longer matches; the flow must then be fetched.
+        """
+        target = self.run_dir / filename
+        self._ensure_parent(target)
+
+        if is_archive(previous_snapshot):
+            content = read_entry(previous_snapshot, previous)
+            if content is None:
+                return None
+            self._commit(target, content)
+            return {"filename": filename, "hash": previous["hash"]}
+
+        source = previous_snapshot / previous["filename"]
+        if not source.is_file():
+            return None
+        if source.resolve() != target.resolve():
+            _link_or_copy(source, target)
+        # Hash the linked file, not the source: the source may be replaced
+        # by a concurrent write, but the link keeps the inode it was made to.
+        if self._hash(target.read_bytes()) != previous["hash"]:
+            return None
+        return {"filename": filename, "hash": previous["hash"]}
+
+    def resume_entry(self, entry: dict) -> bool:
+        """
+        Check that a flow journaled by an interrupted run is still on disk.
+
+        The file is included in the final fsync batch, since the process
+        that wrote it may have died before flushing it.
+
+        Args:
+            entry: Index entry recorded in the journal.
+
+        Returns:
+            True if the entry's file exists and can be reused.
+        """
+        path = entry_path(self.run_dir, entry)
+        if not path.is_file():
+            return False
+        if self.fsync:
+            with self._lock:
+                self._written.append(path)
+        return True
+
+    def abort(self) -> None:
+        """Clean up after a failed run. Files already written are kept."""
+
+    def _sync_written(self) -> None:
+        """Flush written files and their directories in one batch."""
+        directories = set()
+        for path in self._written:
+            fsync_path(path)
+            directories.add(path.parent)
+        for directory in directories:
+            fsync_path(directory)
+        self._written.clear()
+
+    def write_index(self, timestamp: str, index_entries: list) -> Path:
+        """
+        Atomically write _index.json once all flow files are in place.
+
+        Args:
+            timestamp: Run timestamp.
+            index_entries: Index entries in list_flows order.
+
+        Returns:
+            Path to the snapshot (the run directory).
+        """
+        if self.fsync:
+            self._sync_written()
+
+        index = {"timestamp": timestamp, "flows": index_entries}
+        if self.format != FileStore.format:
+            index["format"] = self.format
+        if self.json_style != "indent":
+            index["style"] = self.json_style
+        if self.layout != "flat":
+            index["layout"] = self.layout
+
+        index_path = self.run_dir / INDEX_NAME
+        atomic_write(index_path, json.dumps(index, indent=2).encode("utf-8"))
+        if self.fsync:
+            fsync_path(index_path)
+            fsync_path(self.run_dir)
+        return self.run_dir
+
+
+class ContentStore(FileStore):
+    """
+    Content-addressed store that keeps each distinct flow body once.
+
+    Bodies live under objects/<hash[:2]>/<hash>.json in the output root and
+    each run's _index.json points at them with a path relative to the run
+    directory, so verify_backups and restore_flow resolve them unchanged.
+    """
+
+    format = "cas"
+
+    def __init__(
+        self,
+        run_dir: Path,
+        objects_dir: Path,
+        fsync: bool = False,
+        metrics: Optional["Metrics"] = None,
+        json_style: str = "indent",
+        layout: str = "flat",
+    ):
+        """
+        Initialize store.
+
+        Args:
+            run_dir: Directory for this backup run's _index.json.
+            objects_dir: Shared blob directory, usually <output_dir>/objects.
+            fsync: If True, flush new blobs to disk before the index is committed.
+            metrics: Metrics collector timing the serialize, hash and write stages.
+            json_style: "indent" or "compact" canonical JSON (see serialize_flow).
+            layout: Ignored; blobs are always stored by hash, so every layout
+                is collision-free.
+        """
+        super().__init__(run_dir, fsync=fsync, metrics=metrics, json_style=json_style)
+        self.objects_dir = objects_dir
+
+    def blob_path(self, digest: str) -> Path:
+        """Return the blob path for a SHA-256 hex digest."""
+        return self.objects_dir / digest[:2] / f"{digest}.json"
+
+    def _relative(self, path: Path) -> str:
+        return Path(os.path.relpath(path, self.run_dir)).as_posix()
+
+    def write(self, filename: str, details: dict) -> dict:
+        content = self._serialize(details)
+        digest = self._hash(content)
+        blob = self.blob_path(digest)
+        if not blob.exists():
+            with self._stage("write"):
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                self._commit(blob, content)
+        return {"filename": self._relative(blob), "hash": digest}
+
+    def carry_forward(
+        self, filename: str, previous: dict, previous_snapshot: Path
+    ) -> Optional[dict]:
+        blob = self.blob_path(previous["hash"])
+        if not blob.is_file():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            if is_archive(previous_snapshot):
+                content = read_entry(previous_snapshot, previous)
+                if content is None:
+                    return None
+                self._commit(blob, content)
+            else:
+                source = previous_snapshot / previous["filename"]
+                if not source.is_file():
+                    return None
+                content = source.read_bytes()
+                if self._hash(content) != previous["hash"]:
+                    return None
+                self._commit(blob, content)
+        return {"filename": self._relative(blob), "hash": previous["hash"]}
+
+
+class ArchiveStore(FileStore):
+    """
+    Writes a whole run into one compressed zip archive.
+
+    Each flow is a separately deflated member and _index.json is stored
+    inside the archive, so the zip central directory acts as an offset
+    index: one flow can be read without decompressing the rest.
+    """
+
+    format = "archive"
+
+    def __init__(
+        self,
+        archive_path: Path,
+        timestamp: str,
+        fsync: bool = False,
+        metrics: Optional["Metrics"] = None,
+        json_style: str = "indent",
+        layout: str = "flat",
+    ):
+        """
+        Initialize store.
+
+        Args:
+            archive_path: Destination .zip path. The archive is built under a
+                temporary name and renamed into place by write_index.
+            timestamp: Run timestamp, used as the member modification time.
+            fsync: If True, flush the archive to disk before it is renamed.
+            metrics: Metrics collector timing the serialize, hash and write
+                (compress) stages.
+            json_style: "indent" or "compact" canonical JSON (see serialize_flow).
+            layout: File layout of the member names, recorded in _index.json.
+        """
+        super().__init__(
+            archive_path.parent, fsync=fsync, metrics=metrics,
+            json_style=json_style, layout=layout,
+        )
+        self.archive_path = archive_path
+        self.snapshot_path = archive_path
+        self._tmp_path = _temp_path(archive_path)
+        self._date_time = tuple(
+            int(part) for part in (
+                timestamp[0:4], timestamp[5:7], timestamp[8:10],
+                timestamp[11:13], timestamp[13:15], timestamp[15:17],
+            )
+        )
+        self._archive = zipfile.ZipFile(
+            self._tmp_path, "x", compression=zipfile.ZIP_DEFLATED
+        )
+
+    def _add(self, name: str, content: bytes) -> None:
+        info = zipfile.ZipInfo(name, date_time=self._date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        with self._lock:
+            self._archive.writestr(info, content)
+
+    def write(self, filename: str, details: dict) -> dict:
+        content = self._serialize(details)
+        with self._stage("write"):
+            self._add(filename, content)
+        return {"filename": filename, "hash": self._hash(content)}
+
+    def carry_forward(
+        self, filename: str, previous: dict, previous_snapshot: Path
+    ) -> Optional[dict]:
+        content = read_entry(previous_snapshot, previous)
+        if content is None:
+            return None
+        self._add(filename, content)
+        return {"filename": filename, "hash": previous["hash"]}
+
+    def abort(self) -> None:
+        """Discard a partially written archive."""
+        self._archive.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def write_index(self, timestamp: str, index_entries: list) -> Path:
+        """
+        Add _index.json to the archive and atomically move it into place.
+
+        Returns:
+            Path to the archive.
+        """
+        index = {"timestamp": timestamp, "flows": index_entries, "format": self.format}
+        if self.json_style != "indent":
+            index["style"] = self.json_style
+        if self.layout != "flat":
+            index["layout"] = self.layout
+        self._add(INDEX_NAME, json.dumps(index, indent=2).encode("utf-8"))
+        self._archive.close()
+        if self.fsync:
+            fsync_path(self._tmp_path)
+        os.replace(self._tmp_path, self.archive_path)
+        if self.fsync:
+            fsync_path(self.archive_path.parent)
+        return self.archive_path
+
+
+class Journal:
+    """
+    Append-only progress log of a backup run, used to resume it.
+
+    The first line records the run timestamp, output format, JSON style
+    and file layout; every further line is the index entry of one
+    completed flow. Each line is flushed as soon as it is written (and
+    fsynced with fsync=True), so a killed run loses at most the flows that
+    were in flight.
+    """
+
+    def __init__(self, path: Path, fsync: bool = False):
+        """
+        Initialize journal.
+
+        Args:
+            path: Journal file, normally <run_dir>/_journal.jsonl.
+            fsync: If True, fsync the journal after every line.
+        """
+        self.path = path
+        self.fsync = fsync
+        self._file = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def read(path: Path) -> tuple:
+        """
+        Read a journal left by an interrupted run.
+
+        A partially written last line is ignored.
+
+        Args:
+            path: Journal file.
+
+        Returns:
+            Tuple of (header dict, dict mapping flow ID to index entry).
+        """
+        header: dict = {}
+        entries: dict = {}
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if "id" in record:
+                    entries[str(record["id"])] = record
+                elif not header:
+                    header = record
+        return header, entries
+
+    def start(
+        self,
+        timestamp: str,
+        output_format: str,
+        resume: bool = False,
+        json_style: str = "indent",
+        layout: str = "flat",
+    ) -> None:
+        """
+        Open the journal for writing.
+
+        Args:
+            timestamp: Run timestamp.
+            output_format: Store format of the run.
+            resume: If True, append to the existing journal instead of
+                starting a new one. A partially written last line left by
+                the interrupted run is cut off first.
+            json_style: JSON style of the run's flow files.
+            layout: File layout of the run.
+        """
+        if resume:
+            kept = self._drop_partial_line()
+            self._file = self.path.open("a", encoding="utf-8")
+            if kept:
+                return
+        else:
+            self._file = self.path.open("w", encoding="utf-8")
+        header = {"timestamp": timestamp, "format": output_format}
+        if json_style != "indent":
+            header["style"] = json_style
+        if layout != "flat":
+            header["layout"] = layout
+        self._write(header)
+
+    def _drop_partial_line(self) -> int:
+        """
+        Truncate the journal after its last newline.
+
+        A run killed mid-write leaves a line without one, and the next
+        entry appended to it would be lost with it.
+
+        Returns:
+            Size of the journal in bytes after truncation.
+        """
+        with self.path.open("rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end != size:
+                f.truncate(end)
+        return end
+
+    def _write(self, record: dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(record, sort_keys=True) + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def append(self, entry: dict) -> None:
+        """Record a completed flow's index entry."""
+        self._write(entry)
+
+    def close(self) -> None:
+        """Close the journal, keeping it on disk for a later resume."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the journal once the run's index is written."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,345 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+from .snapshot import INDEX_NAME, entry_path, is_archive, load_index
+from .storage import atomic_write
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """
+    SHA-256 a file with chunked reads.
+
+    Args:
+        path: File to hash.
+
+    Returns:
+        Hex digest.
+    """
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+class VerifyCache:
+    """
+    Cache of file hashes keyed on (path, size, mtime, inode).
+
+    Files whose stat signature is unchanged since they were last hashed are
+    not read again. With a path the cache is persisted as JSON between
+    audits; without one it only lives for the current process, which still
+    avoids re-hashing content-addressed blobs shared by many runs.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize cache.
+
+        Args:
+            path: JSON file to load from and save to. None keeps it in memory.
+        """
+        self.path = Path(path) if path is not None else None
+        self._entries: dict = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.is_file():
+            try:
+                with self.path.open("r", encoding="utf-8") as f:
+                    self._entries = json.load(f).get("entries", {})
+            except (OSError, ValueError):
+                self._entries = {}
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> list:
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def get(self, key: str, stat: os.stat_result) -> Optional[str]:
+        """
+        Look up a cached hash.
+
+        Args:
+            key: File path (or archive member key).
+            stat: Current stat result of the file.
+
+        Returns:
+            Cached hex digest, or None if missing or stale.
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached and cached[:3] == self._signature(stat):
+            return cached[3]
+        return None
+
+    def put(self, key: str, stat: os.stat_result, digest: str) -> None:
+        """Record the hash of a file with its stat signature."""
+        with self._lock:
+            self._entries[key] = self._signature(stat) + [digest]
+
+    def save(self) -> None:
+        """Persist the cache, if it has a path."""
+        if self.path is None:
+            return
+        with self._lock:
+            content = json.dumps({"entries": self._entries}, sort_keys=True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, content.encode("utf-8"))
+
+
+def _hash_entry(
+    snapshot_path: Path,
+    entry: dict,
+    archive: Optional[zipfile.ZipFile],
+    archive_stat: Optional[os.stat_result],
+    cache: Optional[VerifyCache],
+) -> Optional[str]:
+    """Hash one entry's stored bytes, or return None if it is missing."""
+    if archive is not None:
+        name = entry["filename"]
+        key = f"{snapshot_path.resolve()}!{name}"
+        if cache is not None:
+            cached = cache.get(key, archive_stat)
+            if cached:
+                return cached
+        try:
+            digest = hashlib.sha256(archive.read(name)).hexdigest()
+        except KeyError:
+            return None
+        if cache is not None:
+            cache.put(key, archive_stat, digest)
+        return digest
+
+    path = entry_path(snapshot_path, entry)
+    try:
+        stat = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    key = str(path.resolve())
+    if cache is not None:
+        cached = cache.get(key, stat)
+        if cached:
+            return cached
+    digest = hash_file(path)
+    if cache is not None:
+        cache.put(key, stat, digest)
+    return digest
+
+
+def verify_backups(
+    snapshot_dir: Optional[Union[str, Path]] = None,
+    max_workers: int = 1,
+    cache: Optional[Union[VerifyCache, str, Path]] = None,
+) -> dict:
+    """
+    Verify all workflow backups against their stored SHA-256 hashes.
+
+    Args:
+        snapshot_dir: Directory containing snapshots, or a snapshot archive.
+            Defaults to ./snapshots/.
+        max_workers: Number of files to hash concurrently.
+        cache: VerifyCache, or path to a cache file, used to skip files whose
+            size, mtime and inode are unchanged since they were last hashed.
+
+    Returns:
+        Dict with 'verified', 'failed', and 'missing' lists of filenames.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+
+    if snapshot_dir is None:
+        snapshot_path = Path.cwd() / "snapshots"
+    else:
+        snapshot_path = Path(snapshot_dir)
+
+    owns_cache = cache is not None and not isinstance(cache, VerifyCache)
+    if owns_cache:
+        cache = VerifyCache(cache)
+
+    index = load_index(snapshot_path)
+    entries = [
+        flow for flow in index.get("flows", [])
+        if flow.get("filename") and flow.get("hash")
+    ]
+
+    archive = None
+    archive_stat = None
+    if is_archive(snapshot_path):
+        archive = zipfile.ZipFile(snapshot_path)
+        archive_stat = snapshot_path.stat()
+
+    def hash_one(entry: dict) -> Optional[str]:
+        return _hash_entry(snapshot_path, entry, archive, archive_stat, cache)
+
+    try:
+        if max_workers == 1:
+            digests = [hash_one(entry) for entry in entries]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                digests = list(executor.map(hash_one, entries))
+    finally:
+        if archive is not None:
+            archive.close()
+
+    results: dict = {"verified": [], "failed": [], "missing": []}
+    for entry, actual_hash in zip(entries, digests):
+        filename = entry["filename"]
+        if actual_hash is None:
+            results["missing"].append(filename)
+        elif actual_hash == entry["hash"]:
+            results["verified"].append(filename)
+        else:
+            results["failed"].append(filename)
+
+    if owns_cache:
+        cache.save()
+
+    return results
+
+
+def find_snapshots(output_dir: Union[str, Path]) -> list:
+    """
+    Find every snapshot (directory with _index.json, or archive) under a root.
+
+    Args:
+        output_dir: Snapshot output root.
+
+    Returns:
+        Sorted list of snapshot paths.
+    """
+    root = Path(output_dir)
+    snapshots = {index_path.parent for index_path in root.rglob(INDEX_NAME)}
+    snapshots.update(p for p in root.rglob("*.zip") if is_archive(p))
+    return sorted(snapshots)
+
+
+def verify_all_snapshots(
+    output_dir: Optional[Union[str, Path]] = None,
+    max_workers: int = 1,
+    cache: Optional[Union[VerifyCache, str, Path]] = None,
+) -> dict:
+    """
+    Verify every snapshot under an output root, e.g. all dated runs.
+
+    Args:
+        output_dir: Snapshot output root. Defaults to ./snapshots/.
+        max_workers: Number of files to hash concurrently.
+        cache: VerifyCache, or path to a cache file. An in-memory cache is
+            used when omitted so blobs shared between runs are hashed once.
+
+    Returns:
+        Dict mapping each snapshot path (relative to output_dir) to its
+        verify_backups result.
+    """
+    root = Path.cwd() / "snapshots" if output_dir is None else Path(output_dir)
+
+    owns_cache = not isinstance(cache, VerifyCache)
+    if owns_cache:
+        cache = VerifyCache(cache)
+
+    results = {}
+    for snapshot in find_snapshots(root):
+        name = snapshot.relative_to(root).as_posix()
+        results[name] = verify_backups(snapshot, max_workers=max_workers, cache=cache)
+
+    if owns_cache:
+        cache.save()
+
+    return results
+
+
+def _print_result(name: str, result: dict, quiet: bool) -> None:
+    """Print one snapshot's verify_backups result."""
+    counts = ", ".join(f"{key}: {len(result[key])}" for key in ("verified", "failed", "missing"))
+    if quiet and not result["failed"] and not result["missing"]:
+        return
+    print(f"{name}: {counts}")
+    for key in ("failed", "missing"):
+        for filename in result[key]:
+            print(f"  {key.upper()}: {filename}")
+
+
+def main() -> None:
+    """CLI entry point for workflows-verify command."""
+    parser = argparse.ArgumentParser(
+        description="Verify workflow backups against the SHA-256 hashes in _index.json. "
+                    "Runs offline; no HubSpot token is needed."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["snapshots"],
+        help="Snapshot directories or archives, or output roots whose snapshots "
+             "are all verified (default: ./snapshots)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of files to hash concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="Skip files whose size, mtime and inode are unchanged since they "
+             "were hashed into this cache file",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Also exit non-zero when backup files are missing",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Only print snapshots with problems")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    cache = VerifyCache(args.cache)
+    results = {}
+    try:
+        for path in map(Path, args.paths):
+            if is_archive(path) or (path / INDEX_NAME).exists():
+                results[str(path)] = verify_backups(path, max_workers=args.workers, cache=cache)
+            elif path.is_dir():
+                for name, result in verify_all_snapshots(
+                    path, max_workers=args.workers, cache=cache
+                ).items():
+                    results[(path / name).as_posix()] = result
+            else:
+                raise FileNotFoundError(f"Snapshot not found: {path}")
+    except (ValueError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        cache.save()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            _print_result(name, result, args.quiet)
+        if not results:
+            print("No snapshots found.")
+
+    failed = sum(len(result["failed"]) for result in results.values())
+    missing = sum(len(result["missing"]) for result in results.values())
+    if not args.json:
+        print(f"\nSnapshots: {len(results)}, failed files: {failed}, missing files: {missing}")
+    if failed or (args.strict and missing):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import pytest
+
+from benchmarks.mock_server import MockHubSpotServer
+from benchmarks.synthetic import generate_flows
+from ft_hubspot_workflow_backup.client import HubSpotClient
+from ft_hubspot_workflow_backup.ratelimit import RateLimiter
+
+
+@pytest.fixture
+def server():
+    """A local stand-in portal with a few small synthetic flows."""
+    with MockHubSpotServer(generate_flows(5, actions=5)) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    """A client for the stand-in portal, without rate-limit waits."""
+    with HubSpotClient(
+        token="test-token", base_url=server.base_url, rate_limiter=RateLimiter(10000, 10)
+    ) as client:
+        yield client
@@ -0,0 +1,114 @@
+import json
+import random
+import time
+
+import pytest
+import requests
+
+from ft_hubspot_workflow_backup.backup import backup_all_flows, normalize_flow, shard_dir
+from ft_hubspot_workflow_backup.serialize import serialize_flow
+from ft_hubspot_workflow_backup.snapshot import entry_path, load_index
+from ft_hubspot_workflow_backup.storage import JOURNAL_NAME
+from ft_hubspot_workflow_backup.verify import verify_backups
+
+
+def _entries(snapshot) -> dict:
+    return {entry["id"]: entry for entry in load_index(snapshot)["flows"]}
+
+
+def _expected_bytes(server, flow_id: str) -> bytes:
+    return serialize_flow(normalize_flow(json.loads(json.dumps(server.flows[flow_id]))))
+
+
+def test_incremental_rename_into_unchanged_flows_name(tmp_path, server, client):
+    first, second = list(server.flows)[:2]
+    server.update_flow(second, name="Copy of X")
+    backup_all_flows(client=client, output_dir=tmp_path)
+
+    # The first flow now slugifies like the second, unchanged one, and is
+    # listed (and written) before it.
+    server.update_flow(first, name="Copy of X")
+    snapshot = backup_all_flows(client=client, output_dir=tmp_path, incremental=True)
+
+    result = verify_backups(snapshot)
+    assert result["failed"] == [] and result["missing"] == []
+    entries = _entries(snapshot)
+    assert entries[first]["filename"] != entries[second]["filename"]
+    for flow_id in (first, second):
+        assert entry_path(snapshot, entries[flow_id]).read_bytes() == _expected_bytes(server, flow_id)
+
+
+def test_id_layout_bounds_directories_for_sparse_ids():
+    rng = random.Random(0)
+    ids = {str(rng.randrange(10**8, 10**10)) for _ in range(5000)}
+    shards = {shard_dir(flow_id, "id") for flow_id in ids}
+    assert len(shards) <= 1000
+    assert shard_dir("123456789", "id") == "789"
+    assert shard_dir("7", "id") == "007"
+
+
+@pytest.mark.parametrize("output_format", ["files", "cas"])
+def test_resume_fetches_only_unfinished_flows(tmp_path, server, client, monkeypatch, output_format):
+    get_flow = client.get_flow
+
+    def interrupt_after(count: int) -> None:
+        fetched = []
+
+        def fetch(flow_id):
+            if len(fetched) == count:
+                raise requests.ConnectionError("connection dropped")
+            fetched.append(flow_id)
+            return get_flow(flow_id)
+
+        monkeypatch.setattr(client, "get_flow", fetch)
+
+    def run(resume: bool):
+        return backup_all_flows(
+            client=client, output_dir=tmp_path, use_date_dir=True,
+            output_format=output_format, resume=resume,
+        )
+
+    interrupt_after(2)
+    with pytest.raises(requests.ConnectionError):
+        run(resume=False)
+    (run_dir,) = tmp_path.glob("2*")
+    journal = run_dir / JOURNAL_NAME
+    with journal.open("a", encoding="utf-8") as f:
+        f.write('{"filename": "cut-off')  # killed mid-write
+
+    # The first resume refetches the edited first flow and journals it
+    # first; that entry must not be lost behind the cut-off line.
+    server.update_flow(list(server.flows)[0], name="Edited flow")
+    interrupt_after(1)
+    with pytest.raises(requests.ConnectionError):
+        run(resume=True)
+
+    monkeypatch.setattr(client, "get_flow", get_flow)
+    gets = server.counts["GET"]
+    snapshot = run(resume=True)
+
+    assert snapshot == run_dir and not journal.exists()
+    assert server.counts["GET"] - gets == 1 + len(server.flows) - 2  # one list page plus the rest
+    result = verify_backups(snapshot)
+    assert result["failed"] == [] and result["missing"] == []
+    entries = _entries(snapshot)
+    assert list(entries) == list(server.flows)
+    for flow_id, entry in entries.items():
+        assert entry_path(snapshot, entry).read_bytes() == _expected_bytes(server, flow_id)
+
+
+def test_incremental_fetches_only_changed_flows(tmp_path, server, client):
+    previous = backup_all_flows(client=client, output_dir=tmp_path, use_date_dir=True)
+    changed = list(server.flows)[1]
+    server.update_flow(changed, name="Renamed flow")
+    time.sleep(1.1)  # dated run names have one-second resolution
+
+    gets = server.counts["GET"]
+    snapshot = backup_all_flows(client=client, output_dir=tmp_path, use_date_dir=True, incremental=True)
+
+    assert server.counts["GET"] - gets == 2  # one list page plus the changed flow
+    previous_entries, entries = _entries(previous), _entries(snapshot)
+    for flow_id, entry in entries.items():
+        path = entry_path(snapshot, entry)
+        assert path.read_bytes() == _expected_bytes(server, flow_id)
+        assert path.samefile(entry_path(previous, previous_entries[flow_id])) == (flow_id != changed)
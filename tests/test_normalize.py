@@ -0,0 +1,141 @@
+"""
+normalize_flow must keep producing byte-identical files.
+
+The iterative sort_filters is compared against the recursive
+implementation it replaced, on synthetic workflows and hand-written edge
+cases, and one small flow's normalized output is pinned verbatim.
+"""
+
+import copy
+import json
+
+import pytest
+
+from benchmarks.synthetic import generate_deep_flow, generate_flows
+from ft_hubspot_workflow_backup.backup import normalize_flow
+from ft_hubspot_workflow_backup.serialize import STYLES, serialize_flow
+
+
+def _reference_filter_key(f: dict) -> tuple:
+    operation = f.get("operation", {})
+    op_value = operation.get("value", "") or str(operation.get("values", []))
+    return (f.get("property", ""), f.get("filterType", ""), op_value)
+
+
+def _reference_branch_key(branch: dict) -> tuple:
+    filters = branch.get("filters", [])
+    if filters:
+        return _reference_filter_key(filters[0])
+    return ("", "", "")
+
+
+def _reference_sort_filters(obj):
+    """The recursive sort_filters, as it was before it became iterative."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key == "filters" and isinstance(value, list):
+                obj[key] = sorted(value, key=_reference_filter_key)
+            elif key == "reEnrollmentTriggersFilterBranches" and isinstance(value, list):
+                for branch in value:
+                    _reference_sort_filters(branch)
+                obj[key] = sorted(value, key=_reference_branch_key)
+            else:
+                _reference_sort_filters(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            _reference_sort_filters(item)
+    return obj
+
+
+def _reference_normalize(flow: dict) -> dict:
+    if "dataSources" in flow and isinstance(flow["dataSources"], list):
+        flow["dataSources"] = sorted(
+            flow["dataSources"],
+            key=lambda ds: (
+                ds.get("objectTypeId", ""),
+                ds.get("associationTypeId", 0),
+                ds.get("name", ""),
+            ),
+        )
+    return _reference_sort_filters(flow)
+
+
+def _filter(prop: str, filter_type: str = "PROPERTY", **operation) -> dict:
+    return {"property": prop, "filterType": filter_type, "operation": operation}
+
+
+def _edge_cases() -> dict:
+    return {
+        "missing_keys": {"filters": [
+            {"property": "b"},
+            {"filterType": "PROPERTY"},
+            {"operation": {"values": ["x"]}},
+            {},
+            _filter("a", value="1"),
+        ]},
+        "value_or_values": {"filters": [
+            _filter("p", value="", values=["z"]),
+            _filter("p", values=["a", "b"]),
+            _filter("p", value="m"),
+            _filter("p", value=None, values=[]),
+        ]},
+        "filters_not_descended": {"filters": [
+            {"property": "b", "filters": [_filter("z"), _filter("a")]},
+            {"property": "a", "filters": [_filter("y"), _filter("b")]},
+        ]},
+        "filters_not_a_list": {"filters": {"inner": {"filters": [_filter("b"), _filter("a")]}}},
+        "reenrollment": {"reEnrollmentTriggersFilterBranches": [
+            {"filters": [_filter("z"), _filter("c")], "filterBranches": [{"filters": [_filter("b"), _filter("a")]}]},
+            {"filters": []},
+            {"filters": [_filter("d"), _filter("b")]},
+        ]},
+        "nested_lists": {"actions": [[{"filters": [_filter("b"), _filter("a")]}], [[{"filters": [_filter("d"), _filter("c")]}]]]},
+        "data_sources": {"dataSources": [
+            {"objectTypeId": "0-2", "name": "b"},
+            {"objectTypeId": "0-1", "associationTypeId": 3, "name": "a"},
+            {"objectTypeId": "0-1", "associationTypeId": 1},
+        ]},
+        "scalars": {"filters": [], "name": "x", "count": 3, "flag": None, "list": [1, "a", None]},
+    }
+
+
+def _corpus() -> dict:
+    corpus = {f"edge_{name}": flow for name, flow in _edge_cases().items()}
+    for flow_id, flow in generate_flows(50, branch_depth=4).items():
+        corpus[f"flow_{flow_id}"] = flow
+    corpus["deep"] = generate_deep_flow(1, depth=200)
+    return corpus
+
+
+CORPUS = _corpus()
+
+
+@pytest.mark.parametrize("style", STYLES)
+@pytest.mark.parametrize("case", sorted(CORPUS))
+def test_normalize_matches_recursive_reference(case, style):
+    flow = CORPUS[case]
+    expected = serialize_flow(_reference_normalize(copy.deepcopy(flow)), style)
+    assert serialize_flow(normalize_flow(copy.deepcopy(flow)), style) == expected
+
+
+def test_normalize_output_is_pinned():
+    flow = {
+        "id": "1",
+        "dataSources": [{"objectTypeId": "0-2"}, {"objectTypeId": "0-1"}],
+        "reEnrollmentTriggersFilterBranches": [
+            {"filters": [_filter("z", value="2"), _filter("b", value="1")]},
+            {"filters": [_filter("a", "CONSTANT", values=["x"])]},
+        ],
+    }
+    expected = {
+        "dataSources": [{"objectTypeId": "0-1"}, {"objectTypeId": "0-2"}],
+        "id": "1",
+        "reEnrollmentTriggersFilterBranches": [
+            {"filters": [{"filterType": "CONSTANT", "operation": {"values": ["x"]}, "property": "a"}]},
+            {"filters": [
+                {"filterType": "PROPERTY", "operation": {"value": "1"}, "property": "b"},
+                {"filterType": "PROPERTY", "operation": {"value": "2"}, "property": "z"},
+            ]},
+        ],
+    }
+    assert serialize_flow(normalize_flow(flow)) == json.dumps(expected, indent=2, sort_keys=True).encode("utf-8")
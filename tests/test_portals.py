@@ -0,0 +1,25 @@
+import json
+
+from ft_hubspot_workflow_backup.portals import load_portals_config
+
+
+def test_option_precedence(tmp_path):
+    config = tmp_path / "portals.json"
+    config.write_text(json.dumps({
+        "defaults": {"output_format": "cas", "incremental": True, "max_workers": 4},
+        "portals": [
+            {"name": "main", "token": "t", "output_dir": "main"},
+            {"name": "eu", "token": "t", "output_dir": "eu", "output_format": "archive"},
+        ],
+    }))
+
+    portals = load_portals_config(
+        config,
+        defaults={"max_workers": 1, "fsync": True},
+        overrides={"output_format": "files", "incremental": False},
+    )
+
+    main, eu = (portal["options"] for portal in portals)
+    assert main == {"output_format": "files", "incremental": False, "max_workers": 4, "fsync": True}
+    assert eu["output_format"] == "archive"
+    assert portals[0]["output_dir"] == str(tmp_path / "main")
@@ -0,0 +1,38 @@
+import time
+
+from ft_hubspot_workflow_backup.backup import backup_all_flows
+from ft_hubspot_workflow_backup.retention import compact_snapshots
+from ft_hubspot_workflow_backup.snapshot import entry_path, load_index
+
+
+def _two_runs(tmp_path, client):
+    older = backup_all_flows(client=client, output_dir=tmp_path, use_date_dir=True)
+    time.sleep(1.1)  # dated run names have one-second resolution
+    newer = backup_all_flows(client=client, output_dir=tmp_path, use_date_dir=True)
+    return older, newer
+
+
+def _paths(snapshot) -> list:
+    return [entry_path(snapshot, entry) for entry in load_index(snapshot)["flows"]]
+
+
+def test_compaction_links_identical_files(tmp_path, client):
+    older, newer = _two_runs(tmp_path, client)
+
+    result = compact_snapshots(tmp_path)
+
+    assert result["linked"] == len(_paths(older))
+    for old, new in zip(_paths(older), _paths(newer)):
+        assert old.samefile(new)
+
+
+def test_compaction_keeps_file_when_newer_copy_is_stale(tmp_path, client):
+    older, newer = _two_runs(tmp_path, client)
+    good = _paths(older)[0].read_bytes()
+    stale = _paths(newer)[0]
+    stale.write_bytes(good.replace(b'"', b"'", 1))  # same size, index not updated
+
+    compact_snapshots(tmp_path)
+
+    assert _paths(older)[0].read_bytes() == good
+    assert not _paths(older)[0].samefile(stale)
@@ -0,0 +1,71 @@
+"""
+Byte-compatibility of the flow serializer backends.
+
+Serializes an edge-case corpus plus synthetic workflows with every
+available backend and style and compares the bytes against the standard
+library reference, so a backend can never change file hashes.
+"""
+
+import json
+
+import pytest
+
+pytest.importorskip("orjson")
+
+from benchmarks.synthetic import generate_flows  # noqa: E402
+from ft_hubspot_workflow_backup.backup import normalize_flow  # noqa: E402
+from ft_hubspot_workflow_backup.serialize import STYLES, available_backends, serialize_flow  # noqa: E402
+
+SYNTHETIC_FLOWS = 100
+
+
+def _reference(details: dict, style: str) -> bytes:
+    """The canonical bytes, as written before backends were pluggable."""
+    if style == "compact":
+        return json.dumps(details, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return json.dumps(details, indent=2, sort_keys=True).encode("utf-8")
+
+
+def _edge_cases() -> dict:
+    """Values where JSON encoders are known to disagree."""
+    cases = {
+        "ascii": {"name": "Lead nurture", "id": "1"},
+        "non_ascii": {"name": "Café – 日本語 – emoji 🎉", "note": "Grüße"},
+        "control_chars": {"text": "tab\tnewline\ncr\rnul\x00bell\x07esc\x1b"},
+        "del_char": {"text": "before\x7fafter"},
+        "line_separators": {"text": "a\u2028b\u2029c"},
+        "quotes_and_slashes": {"text": 'say "hi" \\ path/to </script>'},
+        "lone_surrogate": {"text": "\ud800"},
+        "floats": {"a": 0.1, "b": 1e16, "c": -2.5e-8, "d": 1.0, "e": 123456789.125, "f": 0.00001},
+        "non_finite": {"nan": float("nan"), "inf": float("inf"), "ninf": float("-inf")},
+        "ints": {"small": -1, "big": 2**63 - 1, "neg": -(2**63), "huge": 2**64, "huger": -(2**70)},
+        "bools_and_null": {"t": True, "f": False, "n": None},
+        "empty": {"dict": {}, "list": [], "string": "", "nested": [{}, [], [[]]]},
+        "key_order": {"b": 1, "a": 2, "A": 3, "_": 4, "aa": 5, "ä": 6, "10": 7, "9": 8},
+        "nested": {"l1": {"l2": [{"l3": {"l4": [1, "two", None, {"k": []}]}}]}},
+    }
+    cases["all_edge_cases"] = dict(cases)
+    return cases
+
+
+def test_orjson_backend_available():
+    assert "orjson" in available_backends()
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("style", STYLES)
+@pytest.mark.parametrize("case", sorted(_edge_cases()))
+def test_edge_cases_match_reference(case, style, backend):
+    details = _edge_cases()[case]
+    assert serialize_flow(details, style=style, backend=backend) == _reference(details, style)
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("style", STYLES)
+def test_synthetic_flows_match_reference(style, backend):
+    mismatches = []
+    for flow_id, flow in generate_flows(SYNTHETIC_FLOWS).items():
+        details = normalize_flow(flow)
+        if serialize_flow(details, style=style, backend=backend) != _reference(details, style):
+            mismatches.append(flow_id)
+    assert mismatches == []